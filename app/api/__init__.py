@@ -1,9 +1,24 @@
+from typing import Iterable, Optional
+
 from fastapi import APIRouter
 
-from .v1 import v1_router
+from .v1 import get_v1_router
+
+
+def get_router(groups: Optional[Iterable[str]] = None) -> APIRouter:
+    """
+    Build the API router with the enabled router groups.
+
+    Args:
+        groups (Iterable[str], optional): Names of the v1 groups to mount, all
+        of them when None.
 
-router = APIRouter()
-router.include_router(v1_router, prefix="/v1")
+    Returns:
+        APIRouter: The API router.
+    """
+    router = APIRouter()
+    router.include_router(get_v1_router(groups), prefix="/v1")
+    return router
 
 
-__all__ = ["router"]
+__all__ = ["get_router"]
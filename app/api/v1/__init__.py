@@ -1,15 +1,45 @@
+from importlib import import_module
+from typing import Iterable, Optional
+
 from fastapi import APIRouter
 
-from .inventory import inventory_router
-from .products import products_router
-from .sales import sales_router
-from .home import home_router
-from .revenue import revenue_router
+# Router groups: name -> (module, router attribute, prefix). A group is only
+# imported when it is enabled, so pods serving a subset of the API do not pay
+# for the repositories and schemas of the others.
+ROUTER_GROUPS = {
+    "home": ("app.api.v1.home", "home_router", ""),
+    "inventory": ("app.api.v1.inventory", "inventory_router", "/inventory"),
+    "products": ("app.api.v1.products", "products_router", "/products"),
+    "sales": ("app.api.v1.sales", "sales_router", "/sales"),
+    "revenue": ("app.api.v1.revenue", "revenue_router", "/revenue"),
+    "monitoring": ("app.api.v1.monitoring", "monitoring_router", "/monitoring"),
+    "events": ("app.api.v1.events", "events_router", "/events"),
+}
+
+
+def get_v1_router(groups: Optional[Iterable[str]] = None) -> APIRouter:
+    """
+    Build the v1 router from the enabled router groups.
+
+    Args:
+        groups (Iterable[str], optional): Names of the groups to mount, all of
+        them when None.
+
+    Returns:
+        APIRouter: The v1 router.
 
+    Raises:
+        ValueError: If a group name is unknown.
+    """
+    groups = list(ROUTER_GROUPS) if groups is None else list(groups)
+    unknown = set(groups) - set(ROUTER_GROUPS)
+    if unknown:
+        raise ValueError(f"Unknown router groups: {', '.join(sorted(unknown))}")
 
-v1_router = APIRouter()
-v1_router.include_router(home_router)
-v1_router.include_router(inventory_router, prefix="/inventory")
-v1_router.include_router(products_router, prefix="/products")
-v1_router.include_router(sales_router, prefix="/sales")
-v1_router.include_router(revenue_router, prefix="/revenue")
+    v1_router = APIRouter()
+    for name in groups:
+        module, attribute, prefix = ROUTER_GROUPS[name]
+        v1_router.include_router(
+            getattr(import_module(module), attribute), prefix=prefix
+        )
+    return v1_router
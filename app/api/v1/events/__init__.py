@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+from .events import router
+
+
+events_router = APIRouter()
+events_router.include_router(
+    router,
+    tags=["Events"],
+)
+
+__all__ = ["events_router"]
@@ -0,0 +1,35 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+
+from app.repository.events import stream_events
+from app.schemas.requests.revenue import RevenueGranularity
+from core.config import config
+
+router = APIRouter()
+
+
+@router.get("/stream")
+async def event_stream(
+    low_stock_threshold: Optional[int] = Query(
+        None, description="Only send inventory changes of low stock products"
+    ),
+    product_ids: Optional[List[int]] = Query(
+        None, description="Only send changes of these products"
+    ),
+    revenue: Optional[RevenueGranularity] = Query(
+        None, description="Send revenue changes per day, week or month"
+    ),
+):
+    return StreamingResponse(
+        stream_events(
+            low_stock_threshold=low_stock_threshold,
+            product_ids=product_ids,
+            granularity=revenue,
+            keepalive=config.EVENTS_KEEPALIVE,
+        ),
+        media_type="text/event-stream",
+        # Proxies must not buffer the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
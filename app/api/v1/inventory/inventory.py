@@ -1,32 +1,134 @@
-from typing import List
+from datetime import date
+from typing import List, Optional, Union
 
-from fastapi import APIRouter, Depends
-from sqlmodel import Session
+from fastapi import APIRouter, Depends, Query, Response
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.repository.inventory import get_inventory, update_inventory_db
-from app.schemas.requests.inventory import InventoryUpdate
-from app.schemas.responses.inventory import InventoryChange, InventoryStatus
-from core.database.session import get_session
+from app.repository.inventory import (
+    apply_inventory_changes,
+    get_inventory,
+    get_inventory_history,
+    get_inventory_page,
+    get_inventory_summary,
+    update_inventory_db,
+)
+from app.schemas.requests.inventory import (
+    HistoryInterval,
+    InventoryBulkUpdate,
+    InventoryUpdate,
+)
+from app.schemas.responses.inventory import (
+    InventoryChange,
+    InventoryLevel,
+    InventoryPage,
+    InventoryStatus,
+    InventorySummary,
+)
+from core.cache.etag import conditional
+from core.config import config
+from core.database.session import get_session, get_write_session
+from core.utils.responses import fast_json
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[InventoryStatus])
+@router.get(
+    "/",
+    responses={200: {"model": Union[List[InventoryStatus], InventoryPage]}},
+    dependencies=[conditional("inventory")],
+)
 async def get_inventory_status(
+    response: Response,
     low_stock_threshold: int = 10,
-    db: Session = Depends(get_session),
+    only_low_stock: bool = False,
+    limit: Optional[int] = Query(
+        None,
+        ge=1,
+        description="Page size. Without it, every product is returned, or "
+        "pages of 100 with a cursor.",
+    ),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset pagination cursor. Pass an empty value for the "
+        "first page, then the next_cursor of the previous page.",
+    ),
+    db: AsyncSession = Depends(get_session),
 ):
+    if cursor is not None:
+        inventory_page = await get_inventory_page(
+            db=db,
+            low_stock_threshold=low_stock_threshold,
+            only_low_stock=only_low_stock,
+            cursor=cursor,
+            limit=min(limit or 100, config.PAGE_SIZE_MAX),
+        )
+        return fast_json(inventory_page, response)
+
     inventory_status = await get_inventory(
+        db=db,
+        low_stock_threshold=low_stock_threshold,
+        only_low_stock=only_low_stock,
+        offset=offset,
+        limit=limit,
+    )
+
+    return fast_json(inventory_status, response)
+
+
+@router.get(
+    "/summary",
+    response_model=InventorySummary,
+    dependencies=[conditional("inventory")],
+)
+async def get_inventory_status_summary(
+    low_stock_threshold: int = 10,
+    db: AsyncSession = Depends(get_session),
+):
+    inventory_summary = await get_inventory_summary(
         db=db, low_stock_threshold=low_stock_threshold
     )
 
-    return inventory_status
+    return inventory_summary
 
 
 @router.post("/update", response_model=InventoryChange)
 async def update_inventory(
-    update_data: InventoryUpdate, db: Session = Depends(get_session)
+    update_data: InventoryUpdate, db: AsyncSession = Depends(get_write_session)
 ):
     inventory_change = await update_inventory_db(db=db, update_data=update_data)
 
     return inventory_change
+
+
+@router.post("/bulk-update", response_model=List[InventoryChange])
+async def bulk_update_inventory(
+    bulk: InventoryBulkUpdate, db: AsyncSession = Depends(get_write_session)
+):
+    inventory_changes = await apply_inventory_changes(db=db, updates=bulk.updates)
+
+    return inventory_changes
+
+
+@router.get(
+    "/history",
+    responses={200: {"model": List[InventoryLevel]}},
+    dependencies=[conditional("inventory")],
+)
+async def inventory_history(
+    response: Response,
+    product_ids: List[int] = Query(..., description="List of product IDs"),
+    start_date: date = Query(..., description="Start date"),
+    end_date: date = Query(..., description="End date"),
+    interval: HistoryInterval = HistoryInterval.DAY,
+    db: AsyncSession = Depends(get_session),
+):
+    inventory_levels = await get_inventory_history(
+        db=db,
+        product_ids=product_ids,
+        start_date=start_date,
+        end_date=end_date,
+        interval=interval,
+    )
+
+    return fast_json(inventory_levels, response)
@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+from .monitoring import router
+
+
+monitoring_router = APIRouter()
+monitoring_router.include_router(
+    router,
+    tags=["Monitoring"],
+)
+
+__all__ = ["monitoring_router"]
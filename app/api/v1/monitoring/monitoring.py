@@ -0,0 +1,36 @@
+from typing import List
+
+from fastapi import APIRouter
+
+from app.schemas.extras.monitoring import (
+    CacheStatus,
+    PoolStatus,
+    ReplicaStatus,
+    SlowQuery,
+)
+from core.cache.cache import response_cache
+from core.database.profiling import slow_queries
+from core.database.session import get_pool_status, get_replica_status
+
+
+router = APIRouter()
+
+
+@router.get("/pool", response_model=List[PoolStatus])
+async def pool_status():
+    return get_pool_status()
+
+
+@router.get("/replicas", response_model=List[ReplicaStatus])
+async def replica_status():
+    return get_replica_status()
+
+
+@router.get("/cache", response_model=CacheStatus)
+async def cache_status():
+    return response_cache.stats()
+
+
+@router.get("/slow-queries", response_model=List[SlowQuery])
+async def slow_query_log(limit: int = 50):
+    return list(reversed(slow_queries))[:limit]
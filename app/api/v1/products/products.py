@@ -1,21 +1,43 @@
-from sqlmodel import Session
-from fastapi import APIRouter, Depends, status
-from core.database.session import get_session
+from typing import Optional
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+from fastapi import APIRouter, Depends, Query, status
+from core.cache.etag import conditional
+from core.config import config
+from core.database.session import get_session, get_write_session
 from app.schemas.requests.products import ProductCreate
 from app.schemas.responses.products import ProductResponse
 
-from app.repository.products import get_products_db, create_product
+from app.repository.products import (
+    get_products_db,
+    get_products_page,
+    create_product,
+)
 
 
 product_router = APIRouter()
 
 
-@product_router.get("/", status_code=status.HTTP_200_OK)
+@product_router.get(
+    "/",
+    status_code=status.HTTP_200_OK,
+    dependencies=[conditional("products")],
+)
 async def get_products(
-    limit: int = 10,
-    offset: int = 0,
-    db: Session = Depends(get_session),
+    limit: int = Query(10, ge=1),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset pagination cursor. Pass an empty value for the "
+        "first page, then the next_cursor of the previous page.",
+    ),
+    db: AsyncSession = Depends(get_session),
 ):
+    if cursor is not None:
+        return await get_products_page(
+            db=db, cursor=cursor, limit=min(limit, config.PAGE_SIZE_MAX)
+        )
+
     products = await get_products_db(db=db, offset=offset, limit=limit)
     return products
 
@@ -27,7 +49,7 @@ async def get_products(
 )
 async def register_product(
     product: ProductCreate,
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_write_session),
 ):
     db_product = await create_product(db=db, product=product)
     return db_product
@@ -1,9 +1,9 @@
 from datetime import date, timedelta
-from typing import List
+from typing import List, Optional, Union
 
 from dateutil.relativedelta import relativedelta
-from fastapi import APIRouter, Depends, Query
-from sqlmodel import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.repository.revenue import (
     calculate_daily_revenue,
@@ -13,6 +13,13 @@ from app.repository.revenue import (
     calculate_annual_revenue,
     calculate_products_revenue,
     calculate_category_revenue,
+    calculate_revenue_columns,
+    calculate_revenue_summary,
+)
+from app.schemas.requests.revenue import (
+    RevenueGranularity,
+    RevenueSeries,
+    SeriesFormat,
 )
 from app.schemas.responses.revenue import (
     RevenueCategory,
@@ -22,97 +29,264 @@ from app.schemas.responses.revenue import (
     RevenueMonthly,
     RevenueAnnual,
     RevenueTimePeriod,
+    RevenueSummary,
+    RevenueColumns,
 )
-from core.database.session import get_session
+from core.cache.cache import response_cache
+from core.cache.etag import conditional
+from core.config import config
+from core.database.session import get_read_session
+from core.utils.responses import fast_json
 
 router = APIRouter()
 
 
-@router.get("/timeperiod", response_model=RevenueTimePeriod)
+@router.get(
+    "/timeperiod",
+    response_model=RevenueTimePeriod,
+)
 async def revenue_across_periods(
     start_date: date = Query(..., description="Start date"),
     end_date: date = Query(..., description="End date"),
-    db: Session = Depends(get_session),
+    versions: tuple = conditional("sales", session=get_read_session),
+    db: AsyncSession = Depends(get_read_session),
 ):
-    revenue_analysis = await calculate_revenue_timeperiod(
-        db=db, start_date=start_date, end_date=end_date
+    revenue_analysis = await response_cache.get_or_set(
+        key=("revenue.timeperiod", versions, start_date, end_date),
+        loader=lambda: calculate_revenue_timeperiod(
+            db=db, start_date=start_date, end_date=end_date
+        ),
+        ttl=config.CACHE_TTL_REVENUE,
+        tags=("sales",),
     )
     return revenue_analysis
 
 
-@router.get("/daily", response_model=List[RevenueDaily])
+@router.get(
+    "/summary",
+    response_model=RevenueSummary,
+)
+async def revenue_summary(
+    start_date: Optional[date] = Query(None, description="Start date"),
+    end_date: Optional[date] = Query(None, description="End date"),
+    series: List[RevenueSeries] = Query(
+        list(RevenueSeries), description="Series to return"
+    ),
+    days: Optional[int] = Query(None, description="Range of the daily series"),
+    weeks: Optional[int] = Query(None, description="Range of the weekly series"),
+    months: Optional[int] = Query(None, description="Range of the monthly series"),
+    years: Optional[int] = Query(None, description="Range of the annual series"),
+    versions: tuple = conditional("sales", session=get_read_session),
+    db: AsyncSession = Depends(get_read_session),
+):
+    # Series given their own range end today, as on their own endpoints
+    today = date.today()
+    relative_starts = {}
+    if days is not None:
+        relative_starts[RevenueSeries.DAILY] = today - timedelta(days=days)
+    if weeks is not None:
+        relative_starts[RevenueSeries.WEEKLY] = today - timedelta(weeks=weeks)
+    if months is not None:
+        relative_starts[RevenueSeries.MONTHLY] = today - relativedelta(months=months)
+    if years is not None:
+        relative_starts[RevenueSeries.ANNUAL] = today - relativedelta(years=years)
+
+    ranges = {}
+    for each in set(series):
+        if each in relative_starts:
+            ranges[each] = (relative_starts[each], today)
+        elif start_date is not None and end_date is not None:
+            ranges[each] = (start_date, end_date)
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"start_date and end_date are required for the {each.value} "
+                "series",
+            )
+
+    revenue_summary = await response_cache.get_or_set(
+        key=("revenue.summary", versions, tuple(sorted(ranges.items()))),
+        loader=lambda: calculate_revenue_summary(db=db, ranges=ranges),
+        ttl=config.CACHE_TTL_REVENUE,
+        tags=("sales",),
+    )
+
+    return revenue_summary
+
+
+@router.get(
+    "/daily",
+    responses={200: {"model": Union[List[RevenueDaily], RevenueColumns]}},
+)
 async def daily_revenue(
-    days: int = 7, db: Session = Depends(get_session)
+    response: Response,
+    days: int = 7,
+    dense: bool = Query(False, description="Include periods without sales"),
+    series_format: SeriesFormat = Query(SeriesFormat.ROWS, alias="format"),
+    versions: tuple = conditional("sales", session=get_read_session),
+    db: AsyncSession = Depends(get_read_session),
 ):
     end_date = date.today()
     start_date = end_date - timedelta(days=days)
 
-    revenue_daily = await calculate_daily_revenue(
-        db=db, start_date=start_date, end_date=end_date
+    if series_format == SeriesFormat.COLUMNS:
+        loader = lambda: calculate_revenue_columns(
+            db=db,
+            granularity=RevenueGranularity.DAY,
+            start_date=start_date,
+            end_date=end_date,
+            dense=dense,
+        )
+    else:
+        loader = lambda: calculate_daily_revenue(
+            db=db, start_date=start_date, end_date=end_date, dense=dense
+        )
+
+    revenue_daily = await response_cache.get_or_set(
+        key=("revenue.daily", versions, start_date, end_date, dense, series_format),
+        loader=loader,
+        ttl=config.CACHE_TTL_REVENUE,
+        tags=("sales",),
     )
 
-    return revenue_daily
+    return fast_json(revenue_daily, response)
 
 
-@router.get("/weekly", response_model=List[RevenueWeekly])
+@router.get(
+    "/weekly",
+    responses={200: {"model": Union[List[RevenueWeekly], RevenueColumns]}},
+)
 async def weekly_revenue(
-    weeks: int = 4, db: Session = Depends(get_session)
+    response: Response,
+    weeks: int = 4,
+    dense: bool = Query(False, description="Include periods without sales"),
+    series_format: SeriesFormat = Query(SeriesFormat.ROWS, alias="format"),
+    versions: tuple = conditional("sales", session=get_read_session),
+    db: AsyncSession = Depends(get_read_session),
 ):
     end_date = date.today()
     start_date = end_date - timedelta(weeks=weeks)
 
-    revenue_weekly = await calculate_weekly_revenue(
-        db=db, start_date=start_date, end_date=end_date
+    if series_format == SeriesFormat.COLUMNS:
+        loader = lambda: calculate_revenue_columns(
+            db=db,
+            granularity=RevenueGranularity.WEEK,
+            start_date=start_date,
+            end_date=end_date,
+            dense=dense,
+        )
+    else:
+        loader = lambda: calculate_weekly_revenue(
+            db=db, start_date=start_date, end_date=end_date, dense=dense
+        )
+
+    revenue_weekly = await response_cache.get_or_set(
+        key=("revenue.weekly", versions, start_date, end_date, dense, series_format),
+        loader=loader,
+        ttl=config.CACHE_TTL_REVENUE,
+        tags=("sales",),
     )
 
-    return revenue_weekly
+    return fast_json(revenue_weekly, response)
 
 
-@router.get("/monthly", response_model=List[RevenueMonthly])
+@router.get(
+    "/monthly",
+    responses={200: {"model": Union[List[RevenueMonthly], RevenueColumns]}},
+)
 async def monthly_revenue(
-    months: int = 6, db: Session = Depends(get_session)
+    response: Response,
+    months: int = 6,
+    dense: bool = Query(False, description="Include periods without sales"),
+    series_format: SeriesFormat = Query(SeriesFormat.ROWS, alias="format"),
+    versions: tuple = conditional("sales", session=get_read_session),
+    db: AsyncSession = Depends(get_read_session),
 ):
     end_date = date.today()
     start_date = end_date - relativedelta(months=months)
 
-    revenue_monthly = await calculate_monthly_revenue(
-        db=db, start_date=start_date, end_date=end_date
+    if series_format == SeriesFormat.COLUMNS:
+        loader = lambda: calculate_revenue_columns(
+            db=db,
+            granularity=RevenueGranularity.MONTH,
+            start_date=start_date,
+            end_date=end_date,
+            dense=dense,
+        )
+    else:
+        loader = lambda: calculate_monthly_revenue(
+            db=db, start_date=start_date, end_date=end_date, dense=dense
+        )
+
+    revenue_monthly = await response_cache.get_or_set(
+        key=("revenue.monthly", versions, start_date, end_date, dense, series_format),
+        loader=loader,
+        ttl=config.CACHE_TTL_REVENUE,
+        tags=("sales",),
     )
 
-    return revenue_monthly
+    return fast_json(revenue_monthly, response)
 
 
-@router.get("/annual", response_model=List[RevenueAnnual])
+@router.get(
+    "/annual",
+    response_model=List[RevenueAnnual],
+)
 async def annual_revenue(
-    years: int = 3, db: Session = Depends(get_session)
+    years: int = 3,
+    versions: tuple = conditional("sales", session=get_read_session),
+    db: AsyncSession = Depends(get_read_session),
 ):
     end_date = date.today()
     start_date = end_date - relativedelta(years=years)
 
-    revenue_annual = await calculate_annual_revenue(
-        db=db, start_date=start_date, end_date=end_date
+    revenue_annual = await response_cache.get_or_set(
+        key=("revenue.annual", versions, start_date, end_date),
+        loader=lambda: calculate_annual_revenue(
+            db=db, start_date=start_date, end_date=end_date
+        ),
+        ttl=config.CACHE_TTL_REVENUE,
+        tags=("sales",),
     )
 
     return revenue_annual
 
 
-@router.get("/products", response_model=List[RevenueProduct])
+@router.get(
+    "/products",
+    response_model=List[RevenueProduct],
+)
 async def revenue_across_products(
     product_ids: List[int] = Query(..., description="List of product IDs to compare"),
-    db: Session = Depends(get_session),
+    versions: tuple = conditional("sales", "products", session=get_read_session),
+    db: AsyncSession = Depends(get_read_session),
 ):
-    revenue_product = await calculate_products_revenue(db, product_ids)
+    revenue_product = await response_cache.get_or_set(
+        key=("revenue.products", versions, tuple(sorted(set(product_ids)))),
+        loader=lambda: calculate_products_revenue(db, product_ids),
+        ttl=config.CACHE_TTL_REVENUE,
+        tags=("sales", "products"),
+    )
 
     return revenue_product
 
 
-@router.get("/categories", response_model=List[RevenueCategory])
+@router.get(
+    "/categories",
+    response_model=List[RevenueCategory],
+)
 async def revenue_across_categories(
     category_ids: List[int] = Query(..., description="List of category IDs to compare"),
-    db: Session = Depends(get_session),
+    versions: tuple = conditional("sales", "products", session=get_read_session),
+    db: AsyncSession = Depends(get_read_session),
 ):
-    revenue_categories = await calculate_category_revenue(
-        db=db, category_ids=category_ids
+    revenue_categories = await response_cache.get_or_set(
+        key=("revenue.categories", versions, tuple(sorted(set(category_ids)))),
+        loader=lambda: calculate_category_revenue(
+            db=db, category_ids=category_ids
+        ),
+        ttl=config.CACHE_TTL_REVENUE,
+        tags=("sales", "products"),
     )
 
     return revenue_categories
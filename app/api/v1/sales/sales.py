@@ -1,36 +1,74 @@
 from datetime import date
+from typing import Optional
 
-from fastapi import APIRouter, Depends, status, Query
-from sqlmodel import Session
+from fastapi import APIRouter, Depends, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.repository.sales import (
+    create_sales_bulk,
     get_sales_db,
+    get_sales_page,
     get_sales_date,
     get_sales_product,
     get_sales_category,
     sales_analysis,
+    stream_sales_export,
 )
-from app.schemas.responses.sales import SalesAnalysis
-from core.database.session import get_session
+from app.schemas.requests.sales import ExportFormat, SalesBulkCreate
+from app.schemas.responses.sales import SalesAnalysis, SalesBulkResult
+from core.cache.cache import response_cache
+from core.config import config
+from core.database.session import (
+    get_read_session,
+    get_write_session,
+    wrote_recently,
+)
+from core.utils.responses import fast_json
 
 router = APIRouter()
 
 
 @router.get("/", status_code=status.HTTP_200_OK)
 async def get_sales(
-    limit: int = 10,
-    offset: int = 0,
-    db: Session = Depends(get_session),
+    limit: int = Query(10, ge=1),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset pagination cursor. Pass an empty value for the "
+        "first page, then the next_cursor of the previous page.",
+    ),
+    db: AsyncSession = Depends(get_read_session),
 ):
+    if cursor is not None:
+        return await get_sales_page(
+            db=db, cursor=cursor, limit=min(limit, config.PAGE_SIZE_MAX)
+        )
+
     sales = await get_sales_db(db=db, offset=offset, limit=limit)
     return sales
 
 
+@router.post(
+    "/bulk",
+    status_code=status.HTTP_201_CREATED,
+    response_model=SalesBulkResult,
+)
+async def create_sales(
+    bulk: SalesBulkCreate,
+    db: AsyncSession = Depends(get_write_session),
+):
+    result = await create_sales_bulk(
+        db=db, sales=bulk.sales, batch_size=config.SALES_BULK_BATCH_SIZE
+    )
+    return result
+
+
 @router.get("/date")
 async def filter_sales_date(
     start_date: date = Query(),
     end_date: date = Query(),
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
 ):
     sales = await get_sales_date(
         db=db,
@@ -43,7 +81,7 @@ async def filter_sales_date(
 @router.get("/product")
 async def filter_sales_product(
     product_id: int = Query(),
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
 ):
     sales = await get_sales_product(
         db=db,
@@ -55,7 +93,7 @@ async def filter_sales_product(
 @router.get("/category")
 async def filter_sales_category(
     category_id: int = Query(),
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
 ):
     category = await get_sales_category(
         db=db,
@@ -64,7 +102,44 @@ async def filter_sales_category(
     return category
 
 
-@router.get("/analyze", response_model=SalesAnalysis)
-async def analyze_sales(db: Session = Depends(get_session)):
-    analysis = await sales_analysis(db=db)
-    return analysis
+@router.get("/export")
+async def export_sales(
+    request: Request,
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    product_id: Optional[int] = Query(None),
+    category_id: Optional[int] = Query(None),
+):
+    rows = stream_sales_export(
+        export_format=export_format,
+        batch_size=config.SALES_EXPORT_BATCH_SIZE,
+        start_date=start_date,
+        end_date=end_date,
+        product_id=product_id,
+        category_id=category_id,
+        primary=wrote_recently(request),
+    )
+    media_type = (
+        "text/csv" if export_format == ExportFormat.CSV else "application/x-ndjson"
+    )
+    return StreamingResponse(
+        rows,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename=sales.{export_format.value}"
+        },
+    )
+
+
+@router.get("/analyze", responses={200: {"model": SalesAnalysis}})
+async def analyze_sales(
+    response: Response, db: AsyncSession = Depends(get_read_session)
+):
+    analysis = await response_cache.get_or_set(
+        key=("sales.analyze",),
+        loader=lambda: sales_analysis(db=db),
+        ttl=config.CACHE_TTL_SALES_ANALYSIS,
+        tags=("sales", "products"),
+    )
+    return fast_json(analysis, response)
@@ -1,4 +1,13 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Index, Date, Float
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    ForeignKey,
+    Index,
+    Date,
+    DateTime,
+    Float,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 
@@ -48,8 +57,14 @@ class Inventory(Base):
     # Establishes a bidirectional relationship with requests (many-to-one)
     product = relationship("Product", back_populates="inventory")
 
-    # Adds an index for date for optimized filtering
-    __table_args__ = (Index("idx_inventory_date", "date"),)
+    # Adds an index for date for optimized filtering, one that keeps
+    # products ordered by stock level for low stock queries, and one row
+    # per product, which inventory upserts rely on
+    __table_args__ = (
+        Index("idx_inventory_date", "date"),
+        Index("idx_inventory_quantity_product", "quantity", "product_id"),
+        Index("uq_inventory_product", "product_id", unique=True),
+    )
 
 
 class Sale(Base):
@@ -69,3 +84,34 @@ class Sale(Base):
         Index("idx_sale_date", "date"),
         Index("idx_sale_product_id", "product_id"),
     )
+
+
+class DailySalesRollup(Base):
+    __tablename__ = "daily_sales_rollup"
+
+    # One row per product per day, aggregated from the sales table
+    date = Column(Date, primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    quantity = Column(Integer, nullable=False)
+    revenue = Column(Float, nullable=False)
+    sale_count = Column(Integer, nullable=False)
+
+    # Adds an index for product_id for optimized filtering
+    __table_args__ = (Index("idx_rollup_product_id", "product_id"),)
+
+
+class InventoryMovement(Base):
+    __tablename__ = "inventory_movements"
+
+    # Append-only ledger of inventory changes, written in the same
+    # transaction as the change to the inventory row
+    id = Column(Integer, primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    ts = Column(DateTime, nullable=False)
+    quantity_change = Column(Integer, nullable=False)
+    # Stock level right after the change, so a level at any point in time is
+    # the quantity_after of the last movement before it
+    quantity_after = Column(Integer, nullable=False)
+
+    # Adds an index for the stock history of a product
+    __table_args__ = (Index("idx_movement_product_ts", "product_id", "ts"),)
@@ -0,0 +1,119 @@
+import asyncio
+import json
+from datetime import date, timedelta
+from typing import AsyncIterator, List, Optional
+
+from app.repository.revenue import period_key
+from app.schemas.requests.revenue import RevenueGranularity
+from core.events.hub import INVENTORY_TOPIC, SALES_TOPIC, event_hub
+
+
+def period_start(day: date, granularity: RevenueGranularity) -> date:
+    """
+    Get the first day of the period a day belongs to, with periods as the
+    revenue endpoints count them: weeks start on Sunday and are cut at the
+    start of the year, as MySQL's WEEK().
+    """
+    key = period_key(day, granularity)
+    while period_key(day - timedelta(days=1), granularity) == key:
+        day -= timedelta(days=1)
+    return day
+
+
+def filter_event(
+    event: dict,
+    low_stock_threshold: Optional[int],
+    product_ids: Optional[List[int]],
+    granularity: Optional[RevenueGranularity],
+) -> Optional[tuple]:
+    """
+    Select the part of an event a client subscribed to.
+
+    Args:
+        event: Event published to the hub.
+        low_stock_threshold: Only send inventory changes of products that are,
+            or were before the change, at or below this quantity.
+        product_ids: Only send changes of these products.
+        granularity: Send sales as revenue deltas per period of this length,
+            or not at all when None.
+
+    Returns:
+        tuple: The SSE event name and its data, or None if nothing matched.
+    """
+    data = event["data"]
+
+    if event["topic"] == INVENTORY_TOPIC:
+        changes = []
+        for change in data["changes"]:
+            if product_ids and change["product_id"] not in product_ids:
+                continue
+            if low_stock_threshold is None:
+                changes.append(change)
+                continue
+            low_stock = change["new_quantity"] <= low_stock_threshold
+            previous_quantity = change["new_quantity"] - change["quantity_change"]
+            # Also send products leaving low stock, so clients can drop them
+            if low_stock or previous_quantity <= low_stock_threshold:
+                changes.append({**change, "low_stock": low_stock})
+        return ("inventory", {"changes": changes}) if changes else None
+
+    if event["topic"] == SALES_TOPIC and granularity is not None:
+        periods = {}
+        for sale in data["sales"]:
+            if product_ids and sale["product_id"] not in product_ids:
+                continue
+            period = period_start(date.fromisoformat(sale["date"]), granularity)
+            totals = periods.setdefault(period, {"revenue": 0.0, "quantity": 0})
+            totals["revenue"] += sale["revenue"]
+            totals["quantity"] += sale["quantity"]
+        if not periods:
+            return None
+        return (
+            "revenue",
+            {
+                "granularity": granularity.value,
+                "periods": [
+                    {"period": period.isoformat(), **totals}
+                    for period, totals in sorted(periods.items())
+                ],
+            },
+        )
+
+    return None
+
+
+async def stream_events(
+    low_stock_threshold: Optional[int],
+    product_ids: Optional[List[int]],
+    granularity: Optional[RevenueGranularity],
+    keepalive: float,
+) -> AsyncIterator[str]:
+    """
+    Stream the changes a client subscribed to as Server-Sent Events.
+
+    Inventory changes are sent as "inventory" events and sales as "revenue"
+    events. A "reset" event ends the stream when the client fell too far
+    behind, after which it should reload the state and subscribe again.
+
+    Yields:
+        str: SSE messages, and comments to keep idle connections open.
+    """
+    async with event_hub.subscribe() as subscription:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(), timeout=keepalive
+                )
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+
+            if event is None:
+                yield "event: reset\ndata: {}\n\n"
+                return
+
+            message = filter_event(event, low_stock_threshold, product_ids, granularity)
+            if message is not None:
+                name, data = message
+                yield f"event: {name}\ndata: {json.dumps(data)}\n\n"
@@ -1,54 +1,307 @@
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional
+
 from fastapi import HTTPException, status
-from sqlmodel import Session
+from sqlalchemy import Date, and_, case, func, insert, or_
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.models import Product, Inventory, InventoryMovement
+from app.schemas.requests.inventory import HistoryInterval, InventoryUpdate
+from app.schemas.responses.inventory import InventoryChange
+from core.cache.cache import response_cache
+from core.config import config
+from core.events.hub import INVENTORY_TOPIC, event_hub
+from core.utils.utils import decode_cursor, encode_cursor
+
+
+def inventory_status_query(low_stock_threshold: int, only_low_stock: bool):
+    """
+    Build the inventory status query, with low stock flagged by the database.
+
+    Low stock rows are ordered by quantity then product, which the
+    (quantity, product_id) index serves without sorting, and only the
+    matching index range is read. Otherwise rows are ordered by product.
+    """
+    query = select(
+        Inventory.product_id,
+        Product.name.label("product_name"),
+        Inventory.quantity.label("current_quantity"),
+        (Inventory.quantity <= low_stock_threshold).label("low_stock"),
+    ).join(Product, Product.id == Inventory.product_id)
 
-from app.models.models import Product, Inventory
-from app.schemas.requests.inventory import InventoryUpdate
-from app.schemas.responses.inventory import InventoryStatus, InventoryChange
+    if only_low_stock:
+        return query.where(Inventory.quantity <= low_stock_threshold).order_by(
+            Inventory.quantity, Inventory.product_id
+        )
+    return query.order_by(Inventory.product_id)
 
 
-async def get_inventory(db: Session, low_stock_threshold: int) -> list[InventoryStatus]:
+async def get_inventory(
+    db: AsyncSession,
+    low_stock_threshold: int,
+    only_low_stock: bool = False,
+    offset: int = 0,
+    limit: Optional[int] = None,
+) -> list[dict]:
     """
     Retrieve inventory status, including low stock alerts.
 
     Args:
-        db (Session): The database session.
+        db (AsyncSession): The database session.
+        low_stock_threshold (int): The threshold for low stock alerts.
+        only_low_stock (bool): Only return products at or below the
+            threshold, lowest stock first.
+        offset (int): The number of products to skip.
+        limit (Optional[int]): The maximum number of products to retrieve,
+            or None for all of them.
+
+    Returns:
+        list[dict]: A list of inventory statuses.
+    """
+    query = (
+        inventory_status_query(low_stock_threshold, only_low_stock)
+        .offset(offset)
+        .limit(limit)
+    )
+    inventory = (await db.exec(query)).all()
+
+    return [dict(each._mapping) for each in inventory]
+
+
+async def get_inventory_page(
+    db: AsyncSession,
+    low_stock_threshold: int,
+    only_low_stock: bool,
+    cursor: str,
+    limit: int,
+) -> dict:
+    """
+    Retrieve inventory status with keyset pagination.
+
+    Args:
+        db (AsyncSession): The database session.
+        low_stock_threshold (int): The threshold for low stock alerts.
+        only_low_stock (bool): Only return products at or below the
+            threshold, lowest stock first.
+        cursor (str): Cursor returned with the previous page, or an empty
+            string for the first page.
+        limit (int): The maximum number of products to retrieve.
+
+    Raises:
+        HTTPException: If the cursor is invalid.
+
+    Returns:
+        dict: The inventory statuses under "items" and the cursor of the next
+        page under "next_cursor", which is None on the last page.
+    """
+    query = inventory_status_query(low_stock_threshold, only_low_stock).limit(
+        limit + 1
+    )
+
+    if cursor:
+        try:
+            position = decode_cursor(cursor)
+            last_id = int(position["product_id"])
+            last_quantity = int(position["quantity"]) if only_low_stock else None
+        except (ValueError, KeyError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
+        if only_low_stock:
+            query = query.where(
+                Inventory.quantity >= last_quantity,
+                or_(
+                    Inventory.quantity > last_quantity,
+                    and_(
+                        Inventory.quantity == last_quantity,
+                        Inventory.product_id > last_id,
+                    ),
+                ),
+            )
+        else:
+            query = query.where(Inventory.product_id > last_id)
+
+    inventory = [dict(each._mapping) for each in (await db.exec(query)).all()]
+
+    next_cursor = None
+    if len(inventory) > limit:
+        inventory = inventory[:limit]
+        if inventory:
+            last = inventory[-1]
+            next_cursor = encode_cursor(
+                {"quantity": last["current_quantity"], "product_id": last["product_id"]}
+            )
+
+    return {"items": inventory, "next_cursor": next_cursor}
+
+
+async def get_inventory_summary(db: AsyncSession, low_stock_threshold: int) -> dict:
+    """
+    Count products in stock, at or below the low stock threshold, and out of
+    stock, without returning the rows.
+
+    Args:
+        db (AsyncSession): The database session.
         low_stock_threshold (int): The threshold for low stock alerts.
 
     Returns:
-        list[InventoryStatus]: A list of inventory statuses.
+        dict: total_products, low_stock and out_of_stock counts.
+    """
+    total_products = (await db.exec(select(func.count(Inventory.id)))).one()
+    # Only reads the low stock range of the (quantity, product_id) index
+    low_stock, out_of_stock = (
+        await db.exec(
+            select(
+                func.count(Inventory.product_id),
+                func.coalesce(
+                    func.sum(case((Inventory.quantity <= 0, 1), else_=0)), 0
+                ),
+            ).where(Inventory.quantity <= low_stock_threshold)
+        )
+    ).one()
+
+    return {
+        "total_products": total_products,
+        "low_stock": low_stock,
+        "out_of_stock": out_of_stock,
+    }
+
+
+def inventory_upsert(dialect_name: str, rows: List[dict]):
+    """
+    Build an INSERT of inventory rows that adds the quantity of each row to
+    the existing row of its product instead, relying on the unique index on
+    product_id.
+
+    Args:
+        dialect_name (str): Name of the database dialect.
+        rows (List[dict]): product_id, quantity and date of each row.
     """
-    inventory = (
-        db.query(
-            Product.id.label("product_id"),
-            Product.name.label("product_name"),
-            Inventory.quantity.label("current_quantity"),
+    table = Inventory.__table__
+    if dialect_name == "mysql":
+        statement = mysql.insert(table).values(rows)
+        return statement.on_duplicate_key_update(
+            quantity=table.c.quantity + statement.inserted.quantity,
+            date=statement.inserted.date,
         )
-        .join(Inventory, Product.id == Inventory.product_id)
-        .all()
+
+    insert_ = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    statement = insert_(table).values(rows)
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.product_id],
+        set_={
+            "quantity": table.c.quantity + statement.excluded.quantity,
+            "date": statement.excluded.date,
+        },
     )
 
-    inventory_status = []
 
-    for each in inventory:
-        low_stock_alert = each.current_quantity <= low_stock_threshold
-        inventory_status.append(
-            InventoryStatus(
-                product_id=each.product_id,
-                product_name=each.product_name,
-                current_quantity=each.current_quantity,
-                low_stock=low_stock_alert,
+async def apply_inventory_changes(
+    db: AsyncSession, updates: List[InventoryUpdate]
+) -> List[InventoryChange]:
+    """
+    Apply many inventory deltas in one transaction, and record each of them
+    in the inventory_movements ledger.
+
+    Product IDs are validated with a single IN query, and nothing is written
+    if any of them is missing. Deltas for the same product are summed. All
+    rows are written with one upsert: missing rows are created, and existing
+    ones get an atomic ``quantity = quantity + delta``, so concurrent updates
+    never overwrite each other or create a product's row twice. Rows are
+    written in product ID order, so concurrent transactions lock them in the
+    same order and cannot deadlock.
+
+    Args:
+        db (AsyncSession): The database session.
+        updates (List[InventoryUpdate]): The deltas to apply.
+
+    Raises:
+        HTTPException: If any of the products is not found.
+
+    Returns:
+        List[InventoryChange]: One change per product, in the order the
+        products first appear in the updates.
+    """
+    deltas = {}
+    for update_data in updates:
+        deltas[update_data.product_id] = (
+            deltas.get(update_data.product_id, 0) + update_data.quantity_change
+        )
+    if not deltas:
+        return []
+    product_ids = list(deltas)
+
+    products = dict(
+        (
+            await db.exec(
+                select(Product.id, Product.name).where(Product.id.in_(product_ids))
             )
+        ).all()
+    )
+    missing = [product_id for product_id in deltas if product_id not in products]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Product not found: {', '.join(map(str, missing))}",
         )
 
-    return inventory_status
+    today = date.today()
+    rows = [
+        {"product_id": product_id, "quantity": deltas[product_id], "date": today}
+        for product_id in sorted(deltas)
+    ]
+    await db.execute(inventory_upsert(db.bind.dialect.name, rows))
 
+    # Read within the transaction, which still holds the updated rows
+    quantities = dict(
+        (
+            await db.exec(
+                select(Inventory.product_id, Inventory.quantity).where(
+                    Inventory.product_id.in_(product_ids)
+                )
+            )
+        ).all()
+    )
+    now = datetime.utcnow()
+    await db.execute(
+        insert(InventoryMovement),
+        [
+            {
+                "product_id": product_id,
+                "ts": now,
+                "quantity_change": delta,
+                "quantity_after": quantities[product_id],
+            }
+            for product_id, delta in deltas.items()
+        ],
+    )
+    await db.commit()
+    response_cache.invalidate("inventory")
 
-async def update_inventory_db(db: Session, update_data: InventoryUpdate):
+    inventory_changes = [
+        InventoryChange(
+            product_id=product_id,
+            product_name=products[product_id],
+            quantity_change=delta,
+            new_quantity=quantities[product_id],
+        )
+        for product_id, delta in deltas.items()
+    ]
+    await event_hub.publish(
+        INVENTORY_TOPIC, {"changes": [change.dict() for change in inventory_changes]}
+    )
+
+    return inventory_changes
+
+
+async def update_inventory_db(db: AsyncSession, update_data: InventoryUpdate):
     """
     Update inventory levels and track changes over time.
 
     Args:
-        db (Session): The database session.
+        db (AsyncSession): The database session.
         update_data (InventoryUpdate): The data to update inventory.
 
     Raises:
@@ -57,35 +310,126 @@ async def update_inventory_db(db: Session, update_data: InventoryUpdate):
     Returns:
         InventoryChange: Information about the inventory change.
     """
-    product = db.query(Product).filter(Product.id == update_data.product_id).first()
-    if not product:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Product not found"
-        )
+    inventory_changes = await apply_inventory_changes(db=db, updates=[update_data])
+
+    return inventory_changes[0]
 
-    inventory = (
-        db.query(Inventory)
-        .filter(Inventory.product_id == update_data.product_id)
-        .first()
-    )
 
-    change_in_quantity = update_data.quantity_change
+async def get_inventory_history(
+    db: AsyncSession,
+    product_ids: List[int],
+    start_date: date,
+    end_date: date,
+    interval: HistoryInterval,
+) -> List[dict]:
+    """
+    Get the stock level of products at the end of each day or week.
+
+    Only two indexed queries run against the ledger, whatever the length of
+    the range: one seeks the last movement before the range for each
+    product, the other keeps the last movement of each product per day with
+    a window function. Days without movements carry the previous level.
 
-    if inventory:
-        inventory.quantity += change_in_quantity
-    else:
-        inventory = Inventory(
-            product_id=update_data.product_id, quantity=change_in_quantity
+    Args:
+        db (AsyncSession): The database session.
+        product_ids (List[int]): The products to report.
+        start_date (date): First day of the range.
+        end_date (date): Last day of the range.
+        interval (HistoryInterval): Report a level per day, or per week
+            starting on Monday.
+
+    Raises:
+        HTTPException: If the range or the number of products is larger than
+            configured.
+
+    Returns:
+        List[dict]: Levels shaped as InventoryLevel, ordered by product and
+        date. Weekly levels are dated by the first day of the week within the
+        range.
+    """
+    days = (end_date - start_date).days + 1
+    if days > config.INVENTORY_HISTORY_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"The range covers {days} days, at most "
+            f"{config.INVENTORY_HISTORY_MAX_DAYS} are allowed",
+        )
+    products = len(set(product_ids))
+    if products > config.INVENTORY_HISTORY_MAX_PRODUCTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{products} products requested, at most "
+            f"{config.INVENTORY_HISTORY_MAX_PRODUCTS} are allowed",
         )
-        db.add(inventory)
 
-    db.commit()
+    start = datetime.combine(start_date, time())
+    end = datetime.combine(end_date + timedelta(days=1), time())
 
-    inventory_change = InventoryChange(
-        product_id=product.id,
-        product_name=product.name,
-        quantity_change=change_in_quantity,
-        new_quantity=inventory.quantity,
+    opening_level = (
+        select(InventoryMovement.quantity_after)
+        .where(InventoryMovement.product_id == Product.id)
+        .where(InventoryMovement.ts < start)
+        .order_by(InventoryMovement.ts.desc(), InventoryMovement.id.desc())
+        .limit(1)
+        .scalar_subquery()
     )
+    opening = dict(
+        (
+            await db.exec(
+                select(Product.id, opening_level).where(Product.id.in_(product_ids))
+            )
+        ).all()
+    )
+    if not opening:
+        return []
+
+    day = func.date(InventoryMovement.ts, type_=Date)
+    last_of_day = (
+        select(
+            InventoryMovement.product_id,
+            day.label("day"),
+            InventoryMovement.quantity_after,
+            func.row_number()
+            .over(
+                partition_by=(InventoryMovement.product_id, day),
+                order_by=(InventoryMovement.ts.desc(), InventoryMovement.id.desc()),
+            )
+            .label("position"),
+        )
+        .where(InventoryMovement.product_id.in_(list(opening)))
+        .where(InventoryMovement.ts >= start)
+        .where(InventoryMovement.ts < end)
+        .subquery()
+    )
+    closing = {
+        (row.product_id, row.day): row.quantity_after
+        for row in (
+            await db.exec(
+                select(
+                    last_of_day.c.product_id,
+                    last_of_day.c.day,
+                    last_of_day.c.quantity_after,
+                ).where(last_of_day.c.position == 1)
+            )
+        ).all()
+    }
+
+    levels = []
+    for product_id in sorted(opening):
+        quantity = opening[product_id] or 0
+        current = start_date
+        while current <= end_date:
+            quantity = closing.get((product_id, current), quantity)
+            if interval == HistoryInterval.DAY:
+                bucket = current
+            elif current.weekday() == 6 or current == end_date:
+                bucket = max(current - timedelta(days=current.weekday()), start_date)
+            else:
+                bucket = None
+            if bucket is not None:
+                levels.append(
+                    {"product_id": product_id, "date": bucket, "quantity": quantity}
+                )
+            current += timedelta(days=1)
 
-    return inventory_change
+    return levels
@@ -1,16 +1,19 @@
 from fastapi import status, HTTPException
 from app.models.models import Product, Category
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.schemas.requests.products import ProductCreate
 from sqlalchemy.orm import joinedload
+from core.cache.cache import response_cache
+from core.utils.utils import decode_cursor, encode_cursor
 
 
-async def get_products_db(db: Session, offset: int, limit: int) -> list[Product]:
+async def get_products_db(db: AsyncSession, offset: int, limit: int) -> list[Product]:
     """
     Retrieve a list of products from the database.
 
     Args:
-        db (Session): The database session.
+        db (AsyncSession): The database session.
         offset (int): The starting index of products to retrieve.
         limit (int): The maximum number of products to retrieve.
 
@@ -23,16 +26,60 @@ async def get_products_db(db: Session, offset: int, limit: int) -> list[Product]
         .limit(limit)
         .options(joinedload(Product.category))
     )
-    products = db.exec(query).all()
+    products = (await db.exec(query)).all()
     return products
 
 
-async def create_product(db: Session, product: ProductCreate) -> dict:
+async def get_products_page(db: AsyncSession, cursor: str, limit: int) -> dict:
+    """
+    Retrieve a list of products with keyset pagination, ordered by id.
+
+    Args:
+        db (AsyncSession): The database session.
+        cursor (str): Cursor returned with the previous page, or an empty
+            string for the first page.
+        limit (int): The maximum number of products to retrieve.
+
+    Raises:
+        HTTPException: If the cursor is invalid.
+
+    Returns:
+        dict: The products under "items" and the cursor of the next page
+        under "next_cursor", which is None on the last page.
+    """
+    query = (
+        select(Product)
+        .order_by(Product.id)
+        .limit(limit + 1)
+        .options(joinedload(Product.category))
+    )
+
+    if cursor:
+        try:
+            last_id = int(decode_cursor(cursor)["id"])
+        except (ValueError, KeyError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
+        query = query.where(Product.id > last_id)
+
+    products = (await db.exec(query)).all()
+
+    next_cursor = None
+    if len(products) > limit:
+        products = products[:limit]
+        if products:
+            next_cursor = encode_cursor({"id": products[-1].id})
+
+    return {"items": products, "next_cursor": next_cursor}
+
+
+async def create_product(db: AsyncSession, product: ProductCreate) -> dict:
     """
     Create a new product and add it to the database.
 
     Args:
-        db (Session): The database session.
+        db (AsyncSession): The database session.
         product (ProductCreate): The product data to create.
 
     Raises:
@@ -42,8 +89,8 @@ async def create_product(db: Session, product: ProductCreate) -> dict:
         dict: Information about the created product.
     """
     category = (
-        db.query(Category).where(Category.id == product.category_id).one_or_none()
-    )
+        await db.exec(select(Category).where(Category.id == product.category_id))
+    ).one_or_none()
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -57,8 +104,9 @@ async def create_product(db: Session, product: ProductCreate) -> dict:
         category_id=product.category_id,
     )
     db.add(db_product)
-    db.commit()
-    db.refresh(db_product)
+    await db.commit()
+    await db.refresh(db_product)
+    response_cache.invalidate("products")
 
     # Create a response dictionary
     response_data = {
@@ -68,7 +116,7 @@ async def create_product(db: Session, product: ProductCreate) -> dict:
         "price": db_product.price,
         "category": {
             "id": category.id,
-            "name": category.product,
+            "name": category.name,
         },
     }
 
@@ -1,19 +1,113 @@
+from datetime import date, timedelta
+
 from sqlalchemy import func, and_
+from sqlmodel import select
 
-from app.models.models import Sale, Product, Category
+from app.models.models import DailySalesRollup, Product, Category
+from app.schemas.requests.revenue import RevenueGranularity, RevenueSeries
 from app.schemas.responses.revenue import (
     RevenueCategory,
     RevenueProduct,
-    RevenueDaily,
     RevenueWeekly,
     RevenueMonthly,
     RevenueAnnual,
     RevenueTimePeriod,
+    RevenueSummary,
 )
+from core.database.buckets import month_of, week_of, year_of
 from core.utils.utils import get_month_abbr
 
+# Columns identifying the period of a rollup row, per granularity
+REVENUE_BUCKETS = {
+    RevenueGranularity.DAY: (DailySalesRollup.date,),
+    RevenueGranularity.WEEK: (
+        year_of(DailySalesRollup.date),
+        week_of(DailySalesRollup.date),
+    ),
+    RevenueGranularity.MONTH: (
+        year_of(DailySalesRollup.date),
+        month_of(DailySalesRollup.date),
+    ),
+}
+
+
+def period_key(day: date, granularity: RevenueGranularity):
+    """
+    Key of the period a day belongs to, as returned by the bucket columns of
+    REVENUE_BUCKETS. Weeks are numbered as MySQL's WEEK() and week_of.
+    """
+    if granularity == RevenueGranularity.WEEK:
+        return (day.year, int(day.strftime("%U")))
+    if granularity == RevenueGranularity.MONTH:
+        return (day.year, day.month)
+    return day
+
+
+def period_starts(start_date: date, end_date: date, granularity) -> dict:
+    """
+    Map the key of every period overlapping the range to its first day
+    within the range, in chronological order.
+    """
+    starts = {}
+    day = start_date
+    while day <= end_date:
+        starts.setdefault(period_key(day, granularity), day)
+        day += timedelta(days=1)
+    return starts
 
-async def calculate_daily_revenue(db, start_date, end_date):
+
+async def query_revenue_buckets(db, granularity, start_date, end_date) -> dict:
+    """
+    Sum revenue per period within a date range.
+
+    Returns:
+        dict: Revenue by period key, for the periods that had sales.
+    """
+    buckets = [
+        bucket.label(f"bucket_{index}")
+        for index, bucket in enumerate(REVENUE_BUCKETS[granularity])
+    ]
+    query = (
+        select(*buckets, func.sum(DailySalesRollup.revenue).label("total_revenue"))
+        .filter(DailySalesRollup.date >= start_date, DailySalesRollup.date <= end_date)
+        .group_by(*(bucket.name for bucket in buckets))
+    )
+    revenues = (await db.exec(query)).all()
+
+    if len(buckets) == 1:
+        return {revenue[0]: revenue[1] for revenue in revenues}
+    return {tuple(revenue[:-1]): revenue[-1] for revenue in revenues}
+
+
+async def calculate_revenue_columns(
+    db, granularity, start_date, end_date, dense=False
+) -> dict:
+    """
+    Calculate revenue per period as parallel arrays, ordered by date.
+
+    Args:
+        db: Database session.
+        granularity: RevenueGranularity of the periods.
+        start_date: Start date of the date range.
+        end_date: End date of the date range.
+        dense: Include every period of the range, with 0 revenue for the
+            ones without sales.
+
+    Returns:
+        dict: "dates", the first day of each period within the range, and
+        "revenue", the revenue of each period.
+    """
+    totals = await query_revenue_buckets(db, granularity, start_date, end_date)
+    starts = period_starts(start_date, end_date, granularity)
+    keys = list(starts) if dense else [key for key in starts if key in totals]
+
+    return {
+        "dates": [starts[key] for key in keys],
+        "revenue": [totals.get(key, 0.0) for key in keys],
+    }
+
+
+async def calculate_daily_revenue(db, start_date, end_date, dense=False):
     """
     Calculate daily revenue.
 
@@ -21,17 +115,18 @@ async def calculate_daily_revenue(db, start_date, end_date):
         db: Database session.
         start_date: Start date of the date range.
         end_date: End date of the date range.
+        dense: Include days without sales, with 0 revenue.
 
     Returns:
-        List[RevenueDaily]: List of daily revenue data.
+        List[dict]: Daily revenue data shaped as RevenueDaily, ordered by date.
     """
-    revenues = (
-        db.query(Sale.date, func.sum(Sale.revenue).label("total_revenue"))
-        .filter(Sale.date >= start_date, Sale.date <= end_date)
-        .group_by(Sale.date)
-        .all()
+    columns = await calculate_revenue_columns(
+        db, RevenueGranularity.DAY, start_date, end_date, dense
     )
-    revenue_daily = [RevenueDaily(date=revenue[0], total_revenue=revenue[1]) for revenue in revenues]
+    revenue_daily = [
+        {"date": day, "total_revenue": revenue}
+        for day, revenue in zip(columns["dates"], columns["revenue"])
+    ]
 
     return revenue_daily
 
@@ -48,11 +143,10 @@ async def calculate_revenue_timeperiod(db, start_date, end_date):
     Returns:
         RevenueTimePeriod: Total revenue within the time period.
     """
-    total_revenue = (
-        db.query(func.sum(Sale.revenue))
-        .filter(and_(Sale.date >= start_date, Sale.date <= end_date))
-        .scalar()
+    query = select(func.sum(DailySalesRollup.revenue)).filter(
+        and_(DailySalesRollup.date >= start_date, DailySalesRollup.date <= end_date)
     )
+    total_revenue = (await db.exec(query)).first()
 
     if total_revenue is None:
         total_revenue = 0.0
@@ -64,7 +158,7 @@ async def calculate_revenue_timeperiod(db, start_date, end_date):
     return revenue_analysis
 
 
-async def calculate_weekly_revenue(db, start_date, end_date):
+async def calculate_weekly_revenue(db, start_date, end_date, dense=False):
     """
     Calculate weekly revenue.
 
@@ -72,29 +166,27 @@ async def calculate_weekly_revenue(db, start_date, end_date):
         db: Database session.
         start_date: Start date of the date range.
         end_date: End date of the date range.
+        dense: Include weeks without sales, with 0 revenue.
 
     Returns:
-        List[RevenueWeekly]: List of weekly revenue data.
+        List[dict]: Weekly revenue data shaped as RevenueWeekly, ordered by
+        date.
     """
-    revenues = (
-        db.query(
-            func.year(Sale.date).label("year"),
-            func.week(Sale.date).label("week"),
-            func.sum(Sale.revenue).label("total_revenue"),
-        )
-        .filter(Sale.date >= start_date, Sale.date <= end_date)
-        .group_by("year", "week")
-        .all()
+    columns = await calculate_revenue_columns(
+        db, RevenueGranularity.WEEK, start_date, end_date, dense
     )
-
     revenue_weekly = [
-        RevenueWeekly(week=f"Week {revenue[1]} - {revenue[0]}", total_revenue=revenue[2]) for revenue in revenues
+        {
+            "week": f"Week {int(day.strftime('%U'))} - {day.year}",
+            "total_revenue": revenue,
+        }
+        for day, revenue in zip(columns["dates"], columns["revenue"])
     ]
 
     return revenue_weekly
 
 
-async def calculate_monthly_revenue(db, start_date, end_date):
+async def calculate_monthly_revenue(db, start_date, end_date, dense=False):
     """
     Calculate monthly revenue.
 
@@ -102,24 +194,21 @@ async def calculate_monthly_revenue(db, start_date, end_date):
         db: Database session.
         start_date: Start date of the date range.
         end_date: End date of the date range.
+        dense: Include months without sales, with 0 revenue.
 
     Returns:
-        List[RevenueMonthly]: List of monthly revenue data.
+        List[dict]: Monthly revenue data shaped as RevenueMonthly, ordered by
+        date.
     """
-    revenue = (
-        db.query(
-            func.year(Sale.date).label("year"),
-            func.month(Sale.date).label("month"),
-            func.sum(Sale.revenue).label("total_revenue"),
-        )
-        .filter(Sale.date >= start_date, Sale.date <= end_date)
-        .group_by("year", "month")
-        .all()
+    columns = await calculate_revenue_columns(
+        db, RevenueGranularity.MONTH, start_date, end_date, dense
     )
-
     revenue_monthly = [
-        RevenueMonthly(month=f"{get_month_abbr(revenue[1])} {revenue[0]}", total_revenue=revenue[2])
-        for revenue in revenue
+        {
+            "month": f"{get_month_abbr(day.month)} {day.year}",
+            "total_revenue": revenue,
+        }
+        for day, revenue in zip(columns["dates"], columns["revenue"])
     ]
 
     return revenue_monthly
@@ -137,21 +226,90 @@ async def calculate_annual_revenue(db, start_date, end_date):
     Returns:
         List[RevenueAnnual]: List of annual revenue data.
     """
-    revenues = (
-        db.query(
-            func.year(Sale.date).label("year"),
-            func.sum(Sale.revenue).label("total_revenue"),
+    query = (
+        select(
+            year_of(DailySalesRollup.date).label("year"),
+            func.sum(DailySalesRollup.revenue).label("total_revenue"),
         )
-        .filter(Sale.date >= start_date, Sale.date <= end_date)
+        .filter(DailySalesRollup.date >= start_date, DailySalesRollup.date <= end_date)
         .group_by("year")
-        .all()
+        .order_by("year")
     )
+    revenues = (await db.exec(query)).all()
 
     revenue_annual = [RevenueAnnual(year=revenue[0], total_revenue=revenue[1]) for revenue in revenues]
 
     return revenue_annual
 
 
+async def calculate_revenue_summary(db, ranges):
+    """
+    Calculate several revenue series, each over its own date range, at once.
+
+    Daily revenue is read with a single scan of the union of the ranges,
+    and the weekly, monthly and annual series and the total are rolled up
+    from the days within their range, with the same labels as their own
+    endpoints.
+
+    Args:
+        db: Database session.
+        ranges: Start and end date of each RevenueSeries to return.
+
+    Returns:
+        RevenueSummary: The requested series, the others are None.
+    """
+    revenue_daily = await calculate_daily_revenue(
+        db=db,
+        start_date=min(start_date for start_date, _ in ranges.values()),
+        end_date=max(end_date for _, end_date in ranges.values()),
+    )
+
+    def roll_up(series, period) -> dict:
+        start_date, end_date = ranges[series]
+        totals = {}
+        for revenue in revenue_daily:
+            if start_date <= revenue["date"] <= end_date:
+                key = period(revenue["date"])
+                totals[key] = totals.get(key, 0.0) + revenue["total_revenue"]
+        return totals
+
+    revenue_summary = RevenueSummary()
+    if RevenueSeries.DAILY in ranges:
+        days = roll_up(RevenueSeries.DAILY, lambda day: day)
+        revenue_summary.daily = [
+            {"date": day, "total_revenue": total} for day, total in days.items()
+        ]
+    if RevenueSeries.WEEKLY in ranges:
+        # %U numbers weeks as week_of in calculate_weekly_revenue
+        weeks = roll_up(
+            RevenueSeries.WEEKLY, lambda day: (day.year, int(day.strftime("%U")))
+        )
+        revenue_summary.weekly = [
+            RevenueWeekly(week=f"Week {week} - {year}", total_revenue=total)
+            for (year, week), total in weeks.items()
+        ]
+    if RevenueSeries.MONTHLY in ranges:
+        months = roll_up(RevenueSeries.MONTHLY, lambda day: (day.year, day.month))
+        revenue_summary.monthly = [
+            RevenueMonthly(month=f"{get_month_abbr(month)} {year}", total_revenue=total)
+            for (year, month), total in months.items()
+        ]
+    if RevenueSeries.ANNUAL in ranges:
+        years = roll_up(RevenueSeries.ANNUAL, lambda day: day.year)
+        revenue_summary.annual = [
+            RevenueAnnual(year=year, total_revenue=total)
+            for year, total in years.items()
+        ]
+    if RevenueSeries.TOTAL in ranges:
+        start_date, end_date = ranges[RevenueSeries.TOTAL]
+        revenue_summary.total = RevenueTimePeriod(
+            time_period=f"{start_date} - {end_date}",
+            total_revenue=sum(roll_up(RevenueSeries.TOTAL, lambda day: None).values()),
+        )
+
+    return revenue_summary
+
+
 async def calculate_products_revenue(db, product_ids):
     """
     Calculate revenue for a list of products.
@@ -163,15 +321,16 @@ async def calculate_products_revenue(db, product_ids):
     Returns:
         List[RevenueProduct]: List of product revenue data.
     """
-    revenues = (
-        db.query(
-            Product.name.label("name"), func.sum(Sale.revenue).label("total_revenue")
+    query = (
+        select(
+            Product.name.label("name"),
+            func.sum(DailySalesRollup.revenue).label("total_revenue"),
         )
-        .join(Sale, Product.id == Sale.product_id)
+        .join(DailySalesRollup, Product.id == DailySalesRollup.product_id)
         .filter(Product.id.in_(product_ids))
         .group_by(Product.name)
-        .all()
     )
+    revenues = (await db.exec(query)).all()
     revenue_product = [RevenueProduct(product=revenue[0], total_revenue=revenue[1]) for revenue in revenues]
     return revenue_product
 
@@ -187,16 +346,17 @@ async def calculate_category_revenue(db, category_ids):
     Returns:
         List[RevenueCategory]: List of category revenue data.
     """
-    revenues = (
-        db.query(
-            Category.name.label("name"), func.sum(Sale.revenue).label("total_revenue")
+    query = (
+        select(
+            Category.name.label("name"),
+            func.sum(DailySalesRollup.revenue).label("total_revenue"),
         )
         .join(Product, Product.category_id == Category.id)
-        .join(Sale, Product.id == Sale.product_id)
+        .join(DailySalesRollup, Product.id == DailySalesRollup.product_id)
         .filter(Category.id.in_(category_ids))
         .group_by(Category.name)
-        .all()
     )
+    revenues = (await db.exec(query)).all()
 
     revenue_categories = [
         RevenueCategory(category=revenue[0], total_revenue=revenue[1]) for revenue in revenues
@@ -0,0 +1,144 @@
+from datetime import date
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, func, insert
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.models import DailySalesRollup, Sale
+
+ROLLUP_COLUMNS = ["date", "product_id", "quantity", "revenue", "sale_count"]
+
+# Rollup rows per multi-row upsert, keeps bound parameters under driver limits
+UPSERT_BATCH_SIZE = 500
+
+
+def aggregate_sales(sales: Iterable[dict]) -> list[dict]:
+    """
+    Aggregate sale rows into one rollup row per date and product.
+
+    Args:
+        sales: Sale rows with date, product_id, quantity and revenue.
+
+    Returns:
+        list[dict]: Rollup rows.
+    """
+    rollup = {}
+    for sale in sales:
+        key = (sale["date"], sale["product_id"])
+        row = rollup.get(key)
+        if row is None:
+            rollup[key] = {
+                "date": sale["date"],
+                "product_id": sale["product_id"],
+                "quantity": sale["quantity"],
+                "revenue": sale["revenue"],
+                "sale_count": 1,
+            }
+        else:
+            row["quantity"] += sale["quantity"]
+            row["revenue"] += sale["revenue"]
+            row["sale_count"] += 1
+    return list(rollup.values())
+
+
+def upsert_rollup_statement(dialect_name: str, rows: list[dict]):
+    """
+    Build an INSERT that adds rows onto existing rollup rows.
+
+    Args:
+        dialect_name: Name of the database dialect.
+        rows: Rollup rows, as returned by aggregate_sales.
+
+    Returns:
+        The dialect specific upsert statement.
+    """
+    table = DailySalesRollup.__table__
+
+    if dialect_name == "mysql":
+        statement = mysql.insert(table).values(rows)
+        return statement.on_duplicate_key_update(
+            quantity=table.c.quantity + statement.inserted.quantity,
+            revenue=table.c.revenue + statement.inserted.revenue,
+            sale_count=table.c.sale_count + statement.inserted.sale_count,
+        )
+
+    dialect_insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    statement = dialect_insert(table).values(rows)
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.date, table.c.product_id],
+        set_={
+            "quantity": table.c.quantity + statement.excluded.quantity,
+            "revenue": table.c.revenue + statement.excluded.revenue,
+            "sale_count": table.c.sale_count + statement.excluded.sale_count,
+        },
+    )
+
+
+def rebuild_rollup_statements(
+    start_date: Optional[date] = None, end_date: Optional[date] = None
+) -> list:
+    """
+    Build the statements that recompute the rollup from the sales table.
+
+    Args:
+        start_date: First date to rebuild, or None for no lower bound.
+        end_date: Last date to rebuild, or None for no upper bound.
+
+    Returns:
+        list: A DELETE of the affected rollup rows followed by an
+        INSERT ... SELECT from sales.
+    """
+    delete_query = delete(DailySalesRollup)
+    sales_query = select(
+        Sale.date,
+        Sale.product_id,
+        func.sum(Sale.quantity),
+        func.sum(Sale.revenue),
+        func.count(Sale.id),
+    ).group_by(Sale.date, Sale.product_id)
+
+    if start_date is not None:
+        delete_query = delete_query.where(DailySalesRollup.date >= start_date)
+        sales_query = sales_query.where(Sale.date >= start_date)
+    if end_date is not None:
+        delete_query = delete_query.where(DailySalesRollup.date <= end_date)
+        sales_query = sales_query.where(Sale.date <= end_date)
+
+    insert_query = insert(DailySalesRollup).from_select(ROLLUP_COLUMNS, sales_query)
+    return [delete_query, insert_query]
+
+
+async def apply_sales_to_rollup(db: AsyncSession, sales: Iterable[dict]):
+    """
+    Add newly inserted sales to the rollup, in the caller's transaction.
+
+    Args:
+        db: Database session.
+        sales: Sale rows with date, product_id, quantity and revenue.
+    """
+    rows = aggregate_sales(sales)
+    for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+        batch = rows[start:start + UPSERT_BATCH_SIZE]
+        await db.execute(upsert_rollup_statement(db.bind.dialect.name, batch))
+
+
+async def rebuild_daily_sales_rollup(
+    db: AsyncSession,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+):
+    """
+    Recompute the rollup from the sales table and commit.
+
+    Used to backfill the rollup and to pick up sales written outside the API.
+
+    Args:
+        db: Database session.
+        start_date: First date to rebuild, or None for no lower bound.
+        end_date: Last date to rebuild, or None for no upper bound.
+    """
+    for statement in rebuild_rollup_statements(start_date, end_date):
+        await db.execute(statement)
+    await db.commit()
@@ -1,19 +1,31 @@
+import csv
+import io
+import json
 from datetime import date
+from typing import AsyncIterator, List, Optional
 
-from sqlalchemy import func
+from fastapi import HTTPException, status
+from sqlalchemy import and_, func, insert, or_
 from sqlalchemy.orm import joinedload
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.models.models import Sale, Product, Category
+from app.models.models import DailySalesRollup, Sale, Product, Category
+from app.repository.rollup import apply_sales_to_rollup
+from app.schemas.requests.sales import ExportFormat, SaleCreate
 from app.schemas.responses.sales import (
     ProductSales,
     CategorySales,
     ProductTimePeriod,
-    SalesAnalysis,
+    SalesBulkResult,
 )
+from core.cache.cache import response_cache
+from core.events.hub import SALES_TOPIC, event_hub
+from core.database.session import read_session
+from core.utils.utils import decode_cursor, encode_cursor
 
 
-async def get_sales_db(db: Session, offset: int, limit: int):
+async def get_sales_db(db: AsyncSession, offset: int, limit: int):
     """
     Retrieve sales data with pagination.
 
@@ -25,17 +37,122 @@ async def get_sales_db(db: Session, offset: int, limit: int):
     Returns:
         List[Sale]: List of sales records.
     """
-    sales = (
-        db.query(Sale)
+    query = (
+        select(Sale)
         .offset(offset)
         .limit(limit)
         .options(joinedload(Sale.products))
-        .all()
     )
+    sales = (await db.exec(query)).all()
     return sales
 
 
-async def get_sales_date(db: Session, start_date: date, end_date: date):
+async def get_sales_page(db: AsyncSession, cursor: str, limit: int) -> dict:
+    """
+    Retrieve sales data with keyset pagination, ordered by date and id.
+
+    Unlike offset pagination, each page seeks straight to its first row
+    through idx_sale_date, so deep pages are as fast as the first one.
+
+    Args:
+        db: Database session.
+        cursor: Cursor returned with the previous page, or an empty string
+            for the first page.
+        limit: Maximum number of records to retrieve.
+
+    Raises:
+        HTTPException: If the cursor is invalid.
+
+    Returns:
+        dict: The sales records under "items" and the cursor of the next
+        page under "next_cursor", which is None on the last page.
+    """
+    query = (
+        select(Sale)
+        .order_by(Sale.date, Sale.id)
+        .limit(limit + 1)
+        .options(joinedload(Sale.products))
+    )
+
+    if cursor:
+        try:
+            position = decode_cursor(cursor)
+            last_date = date.fromisoformat(position["date"])
+            last_id = int(position["id"])
+        except (ValueError, KeyError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
+        query = query.filter(
+            Sale.date >= last_date,
+            or_(Sale.date > last_date, and_(Sale.date == last_date, Sale.id > last_id)),
+        )
+
+    sales = (await db.exec(query)).all()
+
+    next_cursor = None
+    if len(sales) > limit:
+        sales = sales[:limit]
+        if sales:
+            last = sales[-1]
+            next_cursor = encode_cursor({"date": last.date.isoformat(), "id": last.id})
+
+    return {"items": sales, "next_cursor": next_cursor}
+
+
+async def create_sales_bulk(
+    db: AsyncSession, sales: List[SaleCreate], batch_size: int
+) -> SalesBulkResult:
+    """
+    Insert many sales in one transaction and update the daily rollup.
+
+    Product IDs are validated with a single IN query. Valid sales are
+    inserted with multi-row INSERTs of batch_size rows, and invalid ones are
+    reported by their position in the request instead of failing the batch.
+
+    Args:
+        db: Database session.
+        sales: The sales to insert.
+        batch_size: Maximum number of rows per INSERT statement.
+
+    Returns:
+        SalesBulkResult: Number of inserted sales and the per-row errors.
+    """
+    product_ids = {sale.product_id for sale in sales}
+    existing_ids = set()
+    if product_ids:
+        existing_ids = set(
+            (await db.exec(select(Product.id).where(Product.id.in_(product_ids)))).all()
+        )
+
+    rows = []
+    errors = []
+    for index, sale in enumerate(sales):
+        if sale.product_id not in existing_ids:
+            errors.append({"index": index, "detail": "Product not found"})
+        elif sale.quantity <= 0:
+            errors.append({"index": index, "detail": "Quantity must be positive"})
+        elif sale.revenue < 0:
+            errors.append({"index": index, "detail": "Revenue must not be negative"})
+        else:
+            rows.append(sale.dict())
+
+    for start in range(0, len(rows), batch_size):
+        await db.execute(insert(Sale), rows[start:start + batch_size])
+    await apply_sales_to_rollup(db, rows)
+    await db.commit()
+
+    if rows:
+        response_cache.invalidate("sales")
+        await event_hub.publish(
+            SALES_TOPIC,
+            {"sales": [{**row, "date": row["date"].isoformat()} for row in rows]},
+        )
+
+    return SalesBulkResult(inserted=len(rows), errors=errors)
+
+
+async def get_sales_date(db: AsyncSession, start_date: date, end_date: date):
     """
     Get total sales within a date range.
 
@@ -49,18 +166,18 @@ async def get_sales_date(db: Session, start_date: date, end_date: date):
     """
     query = (
         select(
-            func.sum(Sale.quantity).label("total_sales"),
+            func.sum(DailySalesRollup.quantity).label("total_sales"),
         )
-        .filter(Sale.date >= start_date)
-        .filter(Sale.date <= end_date)
+        .filter(DailySalesRollup.date >= start_date)
+        .filter(DailySalesRollup.date <= end_date)
     )
-    sales = db.exec(query).first()
+    sales = (await db.exec(query)).first()
 
     sales = ProductTimePeriod(date=f"{start_date} - {end_date}", total_sales=sales)
     return sales
 
 
-async def get_sales_product(db: Session, product_id):
+async def get_sales_product(db: AsyncSession, product_id):
     """
     Get total sales for a specific product.
 
@@ -74,15 +191,15 @@ async def get_sales_product(db: Session, product_id):
     query = (
         select(
             Product.id.label("product_id"),
-            func.sum(Sale.quantity).label("total_sales"),
+            func.sum(DailySalesRollup.quantity).label("total_sales"),
             Product.name.label("product_name"),
         )
-        .join(Product, Product.id == Sale.product_id)
-        .filter(Sale.product_id == product_id)
+        .join(Product, Product.id == DailySalesRollup.product_id)
+        .filter(DailySalesRollup.product_id == product_id)
         .group_by(Product.id,Product.name)
     )
 
-    products = db.exec(query).first()
+    products = (await db.exec(query)).first()
 
     if products:
         return ProductSales(
@@ -94,7 +211,7 @@ async def get_sales_product(db: Session, product_id):
         return None
 
 
-async def get_sales_category(db: Session, category_id):
+async def get_sales_category(db: AsyncSession, category_id):
     """
     Get total sales for a specific category.
 
@@ -109,16 +226,16 @@ async def get_sales_category(db: Session, category_id):
     query = (
         select(
             Category.id.label("category_id"),
-            func.sum(Sale.quantity).label("total_sales"),
+            func.sum(DailySalesRollup.quantity).label("total_sales"),
             Category.name.label("category_name"),
         )
-        .join(Product, Product.id == Sale.product_id)
+        .join(Product, Product.id == DailySalesRollup.product_id)
         .join(Category, Category.id == Product.category_id)
         .filter(Category.id == category_id)
         .group_by(Category.id,Category.name)
     )
 
-    categories = db.exec(query).first()
+    categories = (await db.exec(query)).first()
 
     if categories:
         return CategorySales(
@@ -130,53 +247,195 @@ async def get_sales_category(db: Session, category_id):
         return None
 
 
-async def sales_analysis(db: Session) -> SalesAnalysis:
+async def sales_analysis(db: AsyncSession) -> dict:
     """
     Analyze sales data.
 
+    The per-product aggregate is read from the daily rollup, which already
+    holds the quantity, revenue and number of sales of each product per day,
+    instead of scanning the sales table. The global totals and the
+    per-category aggregate are derived from its rows.
+
     Args:
         db: Database session.
 
     Returns:
-        SalesAnalysis: Analysis results including total sales, average revenue,
-        sales per product, and sales per category.
+        dict: Analysis results shaped as SalesAnalysis, including total sales,
+        average revenue, sales per product, and sales per category.
     """
-    # Calculate total sales (number of sale quantities)
-    total_sales = db.query(func.sum(Sale.quantity)).scalar()
-
-    # Calculate average revenue per sale
-    average_revenue = db.query(func.avg(Sale.revenue)).scalar()
-
-    # Calculate sales per product
-    sales_per_product = (
-        db.query(
+    # Calculate sales per product, along with the category of each product
+    # and the revenue and number of sales the global totals are derived from
+    sales_per_product_query = (
+        select(
             Product.id.label("product_id"),
             Product.name.label("product_name"),
-            func.sum(Sale.quantity).label("total_sales"),
+            Category.id.label("category_id"),
+            Category.name.label("category_name"),
+            func.sum(DailySalesRollup.quantity).label("total_sales"),
+            func.sum(DailySalesRollup.revenue).label("total_revenue"),
+            func.sum(DailySalesRollup.sale_count).label("sale_count"),
         )
-        .join(Sale, Product.id == Sale.product_id)
-        .group_by(Product.id,Product.name)
-        .all()
+        .join(DailySalesRollup, Product.id == DailySalesRollup.product_id)
+        .join(Category, Category.id == Product.category_id)
+        .group_by(Product.id, Product.name, Category.id, Category.name)
     )
+    sales_per_product = (await db.exec(sales_per_product_query)).all()
+
+    # Roll the per-product rows up into the totals and sales per category.
+    # Sums are converted to int and float, since MySQL returns them as
+    # Decimal.
+    total_sales = 0
+    total_revenue = 0.0
+    sale_count = 0
+    sales_per_category = {}
+    for row in sales_per_product:
+        total_sales += int(row.total_sales)
+        total_revenue += float(row.total_revenue)
+        sale_count += int(row.sale_count)
+        category = sales_per_category.setdefault(
+            row.category_id,
+            {
+                "category_id": row.category_id,
+                "category_name": row.category_name,
+                "total_sales": 0,
+            },
+        )
+        category["total_sales"] += int(row.total_sales)
+
+    analysis = {
+        "total_sales": total_sales,
+        "average_revenue": total_revenue / sale_count if sale_count else 0.0,
+        "sales_per_product": [
+            {
+                "product_id": row.product_id,
+                "product_name": row.product_name,
+                "total_sales": int(row.total_sales),
+            }
+            for row in sales_per_product
+        ],
+        "sales_per_category": [
+            sales_per_category[category_id]
+            for category_id in sorted(sales_per_category)
+        ],
+    }
+
+    return analysis
+
 
-    # Calculate sales per category
-    sales_per_category = (
-        db.query(
+EXPORT_COLUMNS = [
+    "id",
+    "date",
+    "quantity",
+    "revenue",
+    "product_id",
+    "product_name",
+    "category_id",
+    "category_name",
+]
+
+
+def sales_export_query(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    product_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+):
+    """
+    Build the query for exporting sales joined with product and category names.
+
+    Args:
+        start_date: Start date of the date range, if any.
+        end_date: End date of the date range, if any.
+        product_id: ID of the product to export sales for, if any.
+        category_id: ID of the category to export sales for, if any.
+
+    Returns:
+        Select: Sales rows ordered by date and id.
+    """
+    query = (
+        select(
+            Sale.id,
+            Sale.date,
+            Sale.quantity,
+            Sale.revenue,
+            Sale.product_id,
+            Product.name.label("product_name"),
             Category.id.label("category_id"),
             Category.name.label("category_name"),
-            func.sum(Sale.quantity).label("total_sales"),
         )
-        .join(Product, Product.category_id == Category.id)
-        .join(Sale, Product.id == Sale.product_id)
-        .group_by(Category.id,Category.name)
-        .all()
+        .join(Product, Product.id == Sale.product_id)
+        .join(Category, Category.id == Product.category_id)
+        .order_by(Sale.date, Sale.id)
     )
 
-    analysis = SalesAnalysis(
-        total_sales=total_sales,
-        average_revenue=average_revenue,
-        sales_per_product=sales_per_product,
-        sales_per_category=sales_per_category,
+    if start_date is not None:
+        query = query.filter(Sale.date >= start_date)
+    if end_date is not None:
+        query = query.filter(Sale.date <= end_date)
+    if product_id is not None:
+        query = query.filter(Sale.product_id == product_id)
+    if category_id is not None:
+        query = query.filter(Category.id == category_id)
+
+    return query
+
+
+def _encode_ndjson(rows) -> str:
+    return "".join(
+        json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=str) + "\n"
+        for row in rows
     )
 
-    return analysis
+
+def _encode_csv(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+async def stream_sales_export(
+    export_format: ExportFormat,
+    batch_size: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    product_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    primary: bool = False,
+) -> AsyncIterator[str]:
+    """
+    Stream sales as NDJSON or CSV chunks.
+
+    Rows are read through a server-side cursor one batch at a time, so memory
+    use does not depend on the number of exported rows. The export opens its
+    own read session because it outlives the request handler.
+
+    Args:
+        export_format: NDJSON or CSV.
+        batch_size: Number of rows fetched and encoded per chunk.
+        start_date: Start date of the date range, if any.
+        end_date: End date of the date range, if any.
+        product_id: ID of the product to export sales for, if any.
+        category_id: ID of the category to export sales for, if any.
+        primary: Read from the primary, as the request's read session would
+            after a recent write by the client.
+
+    Yields:
+        str: Encoded chunks of rows.
+    """
+    query = sales_export_query(
+        start_date=start_date,
+        end_date=end_date,
+        product_id=product_id,
+        category_id=category_id,
+    )
+
+    if export_format == ExportFormat.CSV:
+        encode = _encode_csv
+        yield encode([EXPORT_COLUMNS])
+    else:
+        encode = _encode_ndjson
+
+    async with read_session(primary) as db:
+        result = await db.stream(query)
+        async for rows in result.partitions(batch_size):
+            yield encode(rows)
@@ -0,0 +1,38 @@
+from typing import Iterable
+
+from sqlalchemy import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.models import InventoryMovement, Product, Sale
+
+# Column whose maximum changes whenever the data of a table tag changes.
+# Products and sales are only ever inserted, and every inventory change
+# appends to the movements ledger.
+VERSION_COLUMNS = {
+    "products": Product.id,
+    "inventory": InventoryMovement.id,
+    "sales": Sale.id,
+}
+
+
+async def get_table_versions(db: AsyncSession, tags: Iterable[str]) -> tuple:
+    """
+    Get a version of each table tag, with one query reading only the end of
+    each primary key index.
+
+    Args:
+        db (AsyncSession): The database session.
+        tags (Iterable[str]): Names of the tables, keys of VERSION_COLUMNS.
+
+    Returns:
+        tuple: The version of each tag, in the given order.
+    """
+    # sqlalchemy's select with execute, since sqlmodel's exec returns a bare
+    # scalar instead of a row when only one tag is given
+    query = select(
+        *(
+            select(func.max(VERSION_COLUMNS[tag])).scalar_subquery().label(tag)
+            for tag in tags
+        )
+    )
+    return tuple((await db.execute(query)).one())
@@ -0,0 +1,40 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class PoolStatus(BaseModel):
+    name: str
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_time_total: float
+    wait_time_avg: float
+    wait_time_max: float
+
+
+class CacheStatus(BaseModel):
+    entries: int
+    max_entries: int
+    hits: int
+    misses: int
+    coalesced: int
+    evictions: int
+    invalidations: int
+
+
+class ReplicaStatus(BaseModel):
+    host: Optional[str]
+    healthy: bool
+
+
+class SlowQuery(BaseModel):
+    timestamp: datetime
+    duration_ms: float
+    statement: str
+    path: Optional[str]
+    plan: Optional[List[str]]
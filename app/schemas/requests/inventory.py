@@ -1,6 +1,18 @@
+from enum import Enum
+from typing import List
+
 from pydantic import BaseModel
 
 
+class HistoryInterval(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+
+
 class InventoryUpdate(BaseModel):
     product_id: int
     quantity_change: int
+
+
+class InventoryBulkUpdate(BaseModel):
+    updates: List[InventoryUpdate]
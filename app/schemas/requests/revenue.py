@@ -0,0 +1,20 @@
+from enum import Enum
+
+
+class RevenueGranularity(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class RevenueSeries(str, Enum):
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+    ANNUAL = "annual"
+    TOTAL = "total"
+
+
+class SeriesFormat(str, Enum):
+    ROWS = "rows"
+    COLUMNS = "columns"
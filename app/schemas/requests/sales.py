@@ -0,0 +1,21 @@
+from datetime import date
+from enum import Enum
+from typing import List
+
+from pydantic import BaseModel
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class SaleCreate(BaseModel):
+    date: date
+    quantity: int
+    revenue: float
+    product_id: int
+
+
+class SalesBulkCreate(BaseModel):
+    sales: List[SaleCreate]
@@ -1,3 +1,6 @@
+from datetime import date
+from typing import List, Optional
+
 from pydantic import BaseModel
 
 
@@ -8,8 +11,25 @@ class InventoryStatus(BaseModel):
     low_stock: bool
 
 
+class InventoryPage(BaseModel):
+    items: List[InventoryStatus]
+    next_cursor: Optional[str]
+
+
+class InventorySummary(BaseModel):
+    total_products: int
+    low_stock: int
+    out_of_stock: int
+
+
 class InventoryChange(BaseModel):
     product_id: int
     product_name: str
     quantity_change: int
     new_quantity: int
+
+
+class InventoryLevel(BaseModel):
+    product_id: int
+    date: date
+    quantity: int
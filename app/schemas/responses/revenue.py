@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import date
-from typing import Union
+from typing import List, Optional, Union
 
 
 class RevenueProduct(BaseModel):
@@ -36,3 +36,16 @@ class RevenueMonthly(BaseModel):
 class RevenueAnnual(BaseModel):
     year: str
     total_revenue: float
+
+
+class RevenueSummary(BaseModel):
+    daily: Optional[List[RevenueDaily]]
+    weekly: Optional[List[RevenueWeekly]]
+    monthly: Optional[List[RevenueMonthly]]
+    annual: Optional[List[RevenueAnnual]]
+    total: Optional[RevenueTimePeriod]
+
+
+class RevenueColumns(BaseModel):
+    dates: List[date]
+    revenue: List[float]
@@ -36,3 +36,13 @@ class Sales(BaseModel):
 
     class Config:
         orm_mode = True
+
+
+class SaleError(BaseModel):
+    index: int
+    detail: str
+
+
+class SalesBulkResult(BaseModel):
+    inserted: int
+    errors: List[SaleError]
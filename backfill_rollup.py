@@ -0,0 +1,26 @@
+import argparse
+import asyncio
+from datetime import date
+
+from app.repository.rollup import rebuild_daily_sales_rollup
+from core.database.session import dispose_async_engine, new_session
+
+
+async def backfill(start_date: date = None, end_date: date = None):
+    async with new_session() as db:
+        await rebuild_daily_sales_rollup(
+            db=db, start_date=start_date, end_date=end_date
+        )
+    await dispose_async_engine()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Rebuild the daily_sales_rollup table from the sales table."
+    )
+    parser.add_argument("--start-date", type=date.fromisoformat, default=None)
+    parser.add_argument("--end-date", type=date.fromisoformat, default=None)
+    args = parser.parse_args()
+
+    asyncio.run(backfill(args.start_date, args.end_date))
+    print("Daily sales rollup rebuilt successfully.")
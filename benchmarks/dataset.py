@@ -0,0 +1,91 @@
+import hashlib
+import json
+import os
+from datetime import date
+from pathlib import Path
+
+DATA_DIR = Path(__file__).parent / ".data"
+
+# Number of categories, products and sales for each dataset scale
+SCALES = {
+    "10k": {"categories": 10, "products": 500, "sales": 10_000},
+    "1m": {"categories": 30, "products": 5_000, "sales": 1_000_000},
+    "10m": {"categories": 50, "products": 20_000, "sales": 10_000_000},
+}
+
+# Fixed so that every run of a scale benchmarks the same rows
+START_DATE = date(2021, 1, 1)
+END_DATE = date(2023, 12, 31)
+
+
+def default_database_url(scale: str) -> str:
+    return f"sqlite:///{DATA_DIR / f'bench_{scale}.db'}"
+
+
+def dataset_marker(database_url: str) -> Path:
+    return DATA_DIR / f"{hashlib.sha1(database_url.encode()).hexdigest()}.json"
+
+
+def invalidate_dataset(database_url: str):
+    """
+    Make the next run reseed the database, e.g. after write routes grew it.
+    """
+    dataset_marker(database_url).unlink(missing_ok=True)
+
+
+def prepare_dataset(
+    database_url: str, scale: str, seed: int, workers: int, reseed: bool
+):
+    """
+    Create and seed the benchmark database unless it already holds the same
+    dataset.
+
+    Must run before anything imports core.config, which reads DATABASE_URL
+    from the environment.
+
+    Returns:
+        dict: Description of the dataset.
+    """
+    os.environ["DATABASE_URL"] = database_url
+    dataset = {
+        "scale": scale,
+        "seed": seed,
+        "start_date": START_DATE.isoformat(),
+        "end_date": END_DATE.isoformat(),
+        **SCALES[scale],
+    }
+
+    DATA_DIR.mkdir(exist_ok=True)
+    marker = dataset_marker(database_url)
+    if not reseed and marker.exists() and json.loads(marker.read_text()) == dataset:
+        return dataset
+
+    from sqlalchemy_utils.functions import (
+        create_database,
+        database_exists,
+        drop_database,
+    )
+
+    if database_exists(database_url):
+        drop_database(database_url)
+    create_database(database_url)
+
+    from core.database.migrations import upgrade_database
+    from demo_data import create_demo_data
+
+    upgrade_database()
+    # SQLite only allows one writer at a time
+    if database_url.startswith("sqlite"):
+        workers = 1
+    create_demo_data(
+        num_categories=dataset["categories"],
+        num_products=dataset["products"],
+        num_sales=dataset["sales"],
+        start_date=START_DATE,
+        end_date=END_DATE,
+        seed=seed,
+        workers=workers,
+    )
+
+    marker.write_text(json.dumps(dataset))
+    return dataset
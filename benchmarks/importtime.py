@@ -0,0 +1,121 @@
+"""
+Measure how long a worker takes to import and build the app.
+
+Runs a fresh interpreter with -X importtime for each repeat, and reports the
+wall time until the app object exists along with the modules that took the
+longest to import, cumulatively.
+
+    python -m benchmarks.importtime --output importtime.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.dataset import default_database_url
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Imports the app module and builds the app, as a worker does on boot
+STARTUP_CODE = (
+    "import time; start = time.perf_counter(); "
+    "import core.server; core.server.app; "
+    "print((time.perf_counter() - start) * 1000)"
+)
+
+
+def parse_importtime(stderr: str) -> list[dict]:
+    """
+    Parse the output of -X importtime.
+
+    Returns:
+        list[dict]: module, nesting depth, self_us and cumulative_us of each
+        import.
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        name = module.lstrip()
+        imports.append(
+            {
+                "module": name,
+                # One space after the separator, then two per nesting level
+                "depth": (len(module) - len(name) - 1) // 2,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+            }
+        )
+    return imports
+
+
+def measure_startup(api_routers: str = None) -> tuple[float, list[dict]]:
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", default_database_url("10k"))
+    if api_routers is not None:
+        env["API_ROUTERS"] = api_routers
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_CODE],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(process.stdout.strip().splitlines()[-1]), parse_importtime(
+        process.stderr
+    )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Measure app import time.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument(
+        "--api-routers",
+        help='Router groups to mount as a JSON list, e.g. \'["inventory"]\'.',
+    )
+    parser.add_argument("--output", default="benchmarks/importtime.json")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    startup_ms = []
+    imports = []
+    for _ in range(args.repeat):
+        elapsed, imports = measure_startup(args.api_routers)
+        startup_ms.append(elapsed)
+
+    # Only top level imports, so nested modules are not counted twice
+    total_us = sum(item["cumulative_us"] for item in imports if item["depth"] == 0)
+    slowest = sorted(imports, key=lambda item: item["cumulative_us"], reverse=True)
+    slowest = slowest[: args.top]
+
+    report = {
+        "api_routers": args.api_routers,
+        "startup_ms_median": statistics.median(startup_ms),
+        "startup_ms_min": min(startup_ms),
+        "import_ms_total": total_us / 1000,
+        "modules": len(imports),
+        "slowest_imports": slowest,
+    }
+    print(
+        f"startup median {report['startup_ms_median']:.1f}ms "
+        f"min {report['startup_ms_min']:.1f}ms, "
+        f"{report['modules']} modules imported\n"
+    )
+    for item in slowest:
+        print(f"{item['cumulative_us'] / 1000:9.1f}ms  {item['module']}")
+
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
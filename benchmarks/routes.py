@@ -0,0 +1,215 @@
+from datetime import date, timedelta
+
+from benchmarks.dataset import END_DATE, START_DATE
+
+
+def get_routes() -> list[dict]:
+    """
+    One request per route under app/api/v1.
+
+    Date relative endpoints get ranges reaching back to the start of the
+    dataset, so every run scans the same rows whatever the current date.
+
+    Routes that write are flagged with "writes", since they grow the
+    dataset with every request.
+
+    Returns:
+        list[dict]: name, method, path and params or json body of each request.
+    """
+    today = date.today()
+    days = (today - START_DATE).days
+    years = today.year - START_DATE.year
+    months = years * 12 + today.month - START_DATE.month
+    period = {"start_date": START_DATE.isoformat(), "end_date": END_DATE.isoformat()}
+
+    return [
+        {"name": "home", "method": "GET", "path": "/v1/"},
+        {"name": "inventory", "method": "GET", "path": "/v1/inventory/"},
+        {
+            "name": "inventory.low_stock",
+            "method": "GET",
+            "path": "/v1/inventory/",
+            "params": {"only_low_stock": "true", "cursor": ""},
+        },
+        {
+            "name": "inventory.summary",
+            "method": "GET",
+            "path": "/v1/inventory/summary",
+        },
+        {
+            "name": "inventory.update",
+            "method": "POST",
+            "writes": True,
+            "path": "/v1/inventory/update",
+            "json": {"product_id": 1, "quantity_change": 1},
+        },
+        {
+            "name": "inventory.bulk_update",
+            "method": "POST",
+            "writes": True,
+            "path": "/v1/inventory/bulk-update",
+            "json": {
+                "updates": [
+                    {"product_id": product_id, "quantity_change": 1}
+                    for product_id in range(1, 101)
+                ]
+            },
+        },
+        {
+            "name": "inventory.history",
+            "method": "GET",
+            "path": "/v1/inventory/history",
+            "params": {
+                "product_ids": list(range(1, 11)),
+                "start_date": (today - timedelta(days=90)).isoformat(),
+                "end_date": today.isoformat(),
+                "interval": "day",
+            },
+        },
+        {
+            "name": "products",
+            "method": "GET",
+            "path": "/v1/products/",
+            "params": {"limit": 100, "offset": 1000},
+        },
+        {
+            "name": "products.cursor",
+            "method": "GET",
+            "path": "/v1/products/",
+            "params": {"limit": 100, "cursor": ""},
+        },
+        {
+            "name": "products.register",
+            "method": "POST",
+            "writes": True,
+            "path": "/v1/products/register",
+            "json": {
+                "name": "benchmark",
+                "description": "benchmark product",
+                "price": 9.99,
+                "category_id": 1,
+            },
+        },
+        {
+            "name": "sales",
+            "method": "GET",
+            "path": "/v1/sales/",
+            "params": {"limit": 100, "offset": 5000},
+        },
+        {
+            "name": "sales.cursor",
+            "method": "GET",
+            "path": "/v1/sales/",
+            "params": {"limit": 100, "cursor": ""},
+        },
+        {
+            "name": "sales.bulk",
+            "method": "POST",
+            "writes": True,
+            "path": "/v1/sales/bulk",
+            "json": {
+                "sales": [
+                    {
+                        "date": END_DATE.isoformat(),
+                        "quantity": 1,
+                        "revenue": 9.99,
+                        "product_id": product_id,
+                    }
+                    for product_id in range(1, 101)
+                ]
+            },
+        },
+        {
+            "name": "sales.date",
+            "method": "GET",
+            "path": "/v1/sales/date",
+            "params": period,
+        },
+        {
+            "name": "sales.product",
+            "method": "GET",
+            "path": "/v1/sales/product",
+            "params": {"product_id": 1},
+        },
+        {
+            "name": "sales.category",
+            "method": "GET",
+            "path": "/v1/sales/category",
+            "params": {"category_id": 1},
+        },
+        {
+            "name": "sales.export",
+            "method": "GET",
+            "path": "/v1/sales/export",
+            "params": {
+                "start_date": START_DATE.isoformat(),
+                "end_date": date(2021, 1, 31).isoformat(),
+            },
+        },
+        {"name": "sales.analyze", "method": "GET", "path": "/v1/sales/analyze"},
+        {
+            "name": "revenue.timeperiod",
+            "method": "GET",
+            "path": "/v1/revenue/timeperiod",
+            "params": period,
+        },
+        {
+            "name": "revenue.summary",
+            "method": "GET",
+            "path": "/v1/revenue/summary",
+            "params": period,
+        },
+        {
+            "name": "revenue.daily",
+            "method": "GET",
+            "path": "/v1/revenue/daily",
+            "params": {"days": days},
+        },
+        {
+            "name": "revenue.daily.columns",
+            "method": "GET",
+            "path": "/v1/revenue/daily",
+            "params": {"days": days, "dense": "true", "format": "columns"},
+        },
+        {
+            "name": "revenue.weekly",
+            "method": "GET",
+            "path": "/v1/revenue/weekly",
+            "params": {"weeks": days // 7 + 1},
+        },
+        {
+            "name": "revenue.monthly",
+            "method": "GET",
+            "path": "/v1/revenue/monthly",
+            "params": {"months": months + 1},
+        },
+        {
+            "name": "revenue.annual",
+            "method": "GET",
+            "path": "/v1/revenue/annual",
+            "params": {"years": years + 1},
+        },
+        {
+            "name": "revenue.products",
+            "method": "GET",
+            "path": "/v1/revenue/products",
+            "params": {"product_ids": list(range(1, 11))},
+        },
+        {
+            "name": "revenue.categories",
+            "method": "GET",
+            "path": "/v1/revenue/categories",
+            "params": {"category_ids": [1, 2, 3]},
+        },
+        {"name": "monitoring.pool", "method": "GET", "path": "/v1/monitoring/pool"},
+        {
+            "name": "monitoring.replicas",
+            "method": "GET",
+            "path": "/v1/monitoring/replicas",
+        },
+        {
+            "name": "monitoring.cache",
+            "method": "GET",
+            "path": "/v1/monitoring/cache",
+        },
+    ]
@@ -0,0 +1,252 @@
+"""
+Benchmark every API route in-process, through the ASGI app.
+
+Seeds a deterministic dataset, then sends each route a fixed number of
+requests at each concurrency level and records latency percentiles,
+throughput and peak RSS to a JSON file, optionally compared to a baseline.
+
+    python -m benchmarks.run --scale 1m --output new.json --baseline old.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.dataset import (
+    SCALES,
+    default_database_url,
+    invalidate_dataset,
+    prepare_dataset,
+)
+
+
+def percentile(latencies: list[float], fraction: float) -> float:
+    index = min(len(latencies) - 1, round(fraction * (len(latencies) - 1)))
+    return latencies[index]
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+async def bench_route(client, route: dict, concurrency: int, requests: int) -> dict:
+    latencies = []
+    errors = 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            response = await client.request(
+                route["method"],
+                route["path"],
+                params=route.get("params"),
+                json=route.get("json"),
+            )
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "route": route["name"],
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "throughput_rps": requests / elapsed,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def select_routes(args) -> list[dict]:
+    """
+    Pick the routes to benchmark. Write routes are only run when named with
+    --routes or with --with-writes, since they change the dataset, and after
+    every read route, so that reads always measure the seeded dataset.
+    """
+    from benchmarks.routes import get_routes
+
+    if args.routes:
+        routes = [route for route in get_routes() if route["name"] in args.routes]
+    else:
+        routes = [
+            route
+            for route in get_routes()
+            if args.with_writes or not route.get("writes")
+        ]
+    return sorted(routes, key=lambda route: bool(route.get("writes")))
+
+
+async def run_benchmarks(args, routes: list[dict]) -> list[dict]:
+    import httpx
+
+    from core.server import app
+
+    results = []
+
+    # httpx does not run the ASGI lifespan, which creates the engine
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(app=app, base_url="http://benchmark") as client:
+            for route in routes:
+                # Warm up connections and caches outside the measurement
+                for _ in range(args.warmup):
+                    await client.request(
+                        route["method"],
+                        route["path"],
+                        params=route.get("params"),
+                        json=route.get("json"),
+                    )
+                for concurrency in args.concurrency:
+                    result = await bench_route(
+                        client, route, concurrency, args.requests
+                    )
+                    results.append(result)
+                    print(
+                        f"{result['route']:<22} c={concurrency:<4} "
+                        f"p50={result['p50_ms']:8.2f}ms "
+                        f"p95={result['p95_ms']:8.2f}ms "
+                        f"p99={result['p99_ms']:8.2f}ms "
+                        f"{result['throughput_rps']:8.1f} req/s "
+                        f"errors={result['errors']}"
+                    )
+    return results
+
+
+def compare(results: list[dict], baseline: dict, tolerance: float) -> bool:
+    """
+    Print the change of each result against the baseline.
+
+    Returns:
+        bool: True if no route regressed by more than tolerance.
+    """
+    previous = {
+        (result["route"], result["concurrency"]): result
+        for result in baseline["results"]
+    }
+    ok = True
+    print(f"\nCompared to baseline (tolerance {tolerance:.0%}):")
+    for result in results:
+        old = previous.get((result["route"], result["concurrency"]))
+        if old is None:
+            continue
+        p95_change = result["p95_ms"] / old["p95_ms"] - 1 if old["p95_ms"] else 0.0
+        rps_change = (
+            result["throughput_rps"] / old["throughput_rps"] - 1
+            if old["throughput_rps"]
+            else 0.0
+        )
+        regressed = p95_change > tolerance or rps_change < -tolerance
+        ok = ok and not regressed
+        print(
+            f"{result['route']:<22} c={result['concurrency']:<4} "
+            f"p95 {p95_change:+7.1%}  throughput {rps_change:+7.1%}"
+            f"{'  REGRESSION' if regressed else ''}"
+        )
+    return ok
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the API routes.")
+    parser.add_argument("--scale", choices=SCALES, default="10k")
+    parser.add_argument(
+        "--database-url",
+        help="Database to seed and benchmark, defaults to a SQLite file per scale.",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--seed-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--reseed", action="store_true")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--routes", nargs="*", help="Only benchmark these routes.")
+    parser.add_argument(
+        "--with-writes",
+        action="store_true",
+        help="Also benchmark the write routes. The database is reseeded on the "
+        "next run, since they grow it.",
+    )
+    parser.add_argument(
+        "--with-cache",
+        action="store_true",
+        help="Keep the response cache enabled, which hides database time.",
+    )
+    parser.add_argument("--output", default="benchmarks/results.json")
+    parser.add_argument("--baseline", help="Results file to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    database_url = args.database_url or default_database_url(args.scale)
+
+    # Set before core.config is first imported
+    if not args.with_cache:
+        os.environ["CACHE_TTL_REVENUE"] = "0"
+        os.environ["CACHE_TTL_SALES_ANALYSIS"] = "0"
+    dataset = prepare_dataset(
+        database_url, args.scale, args.seed, args.seed_workers, args.reseed
+    )
+
+    routes = select_routes(args)
+    writes = any(route.get("writes") for route in routes)
+    # Write routes grow the dataset, so the next run must not reuse it
+    if writes:
+        invalidate_dataset(database_url)
+    results = asyncio.run(run_benchmarks(args, routes))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": database_url.split("://")[0],
+            "dataset": dataset,
+            "requests": args.requests,
+            "cache": args.with_cache,
+            "writes": writes,
+        },
+        "results": results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        if not compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
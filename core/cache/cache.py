@@ -0,0 +1,150 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Iterable
+
+from core.config import config
+from core.metrics.metrics import CACHE_EVICTIONS, CACHE_REQUESTS
+
+
+class CacheEntry:
+    __slots__ = ("value", "expires_at", "tags")
+
+    def __init__(self, value: Any, expires_at: float, tags: tuple):
+        self.value = value
+        self.expires_at = expires_at
+        self.tags = tags
+
+
+class ResponseCache:
+    """
+    An in-process TTL cache with LRU eviction for expensive read results.
+
+    Concurrent misses for the same key share a single load. Entries are
+    tagged with the tables they were computed from, so writes can
+    invalidate every entry that depends on a table.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._in_flight: dict = {}
+        # Bumped on invalidation, so loads that started before a write are
+        # not stored after it
+        self._tag_versions: dict = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    async def get_or_set(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: float,
+        tags: Iterable[str] = (),
+    ) -> Any:
+        """
+        Return the cached value for key, loading and storing it on a miss.
+
+        Args:
+            key: Cache key, e.g. the route name plus its normalized params.
+            loader: Coroutine function computing the value.
+            ttl: Seconds the value stays fresh. 0 disables caching.
+            tags: Names of the tables the value is computed from.
+
+        Returns:
+            The cached or freshly loaded value.
+        """
+        if ttl <= 0:
+            return await loader()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                CACHE_REQUESTS.labels("hit").inc()
+                return entry.value
+            del self._entries[key]
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.coalesced += 1
+            CACHE_REQUESTS.labels("coalesced").inc()
+            return await asyncio.shield(in_flight)
+
+        self.misses += 1
+        CACHE_REQUESTS.labels("miss").inc()
+        tags = tuple(tags)
+        versions = [self._tag_versions.get(tag, 0) for tag in tags]
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+
+        future.set_result(value)
+        if versions == [self._tag_versions.get(tag, 0) for tag in tags]:
+            self._store(key, value, ttl, tags)
+        return value
+
+    def _store(self, key: Hashable, value: Any, ttl: float, tags: tuple):
+        self._entries[key] = CacheEntry(value, time.monotonic() + ttl, tags)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+            CACHE_EVICTIONS.inc()
+
+    def invalidate(self, *tags: str):
+        """
+        Drop every entry computed from any of the given tables.
+
+        Args:
+            tags: Names of the tables that were written to.
+        """
+        for tag in tags:
+            self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+        stale = [
+            key
+            for key, entry in self._entries.items()
+            if any(tag in entry.tags for tag in tags)
+        ]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += len(stale)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Report cache usage counters.
+
+        Returns:
+            dict: Entries, capacity and hit/miss/eviction counters.
+        """
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+response_cache = ResponseCache(max_entries=config.CACHE_MAX_ENTRIES)
@@ -0,0 +1,76 @@
+import hashlib
+from datetime import date
+from typing import Callable
+
+from fastapi import Depends, Request, Response
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.repository.versions import get_table_versions
+from core.database.session import get_session
+
+
+class NotModified(Exception):
+    def __init__(self, etag: str):
+        self.etag = etag
+
+
+async def not_modified_handler(request: Request, exc: NotModified) -> Response:
+    return Response(status_code=304, headers={"ETag": exc.etag})
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag, with weak comparison.
+    """
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def conditional(*tags: str, session: Callable = get_session):
+    """
+    Dependency answering conditional GETs of a route computed from the given
+    tables.
+
+    The ETag covers the path, the query parameters, the current date (for
+    routes relative to today) and the version of each table. When it matches
+    the client's If-None-Match, the request ends with 304 Not Modified before
+    the route runs its query. Otherwise the ETag is added to the response.
+
+    The dependency returns the table versions, read on the route's session.
+    Routes that cache their result put them in the cache key, so that a
+    cached body is only sent with the ETag of the data it was computed from,
+    even when another worker wrote or a replica lags.
+
+    Args:
+        tags: Names of the tables the response is computed from.
+        session: Session dependency of the route, so both share a session.
+    """
+
+    async def check_etag(
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(session),
+    ):
+        versions = await get_table_versions(db, tags)
+        key = "|".join(
+            [
+                request.url.path,
+                str(sorted(request.query_params.multi_items())),
+                date.today().isoformat(),
+                *map(str, versions),
+            ]
+        )
+        etag = f'W/"{hashlib.sha1(key.encode()).hexdigest()}"'
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, etag):
+            raise NotModified(etag)
+        response.headers["ETag"] = etag
+        return versions
+
+    return Depends(check_etag)
@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import List, Optional
 from pydantic import BaseSettings
 
 
@@ -16,8 +17,78 @@ class BaseConfig(BaseSettings):
 class Config(BaseConfig):
     ENVIRONMENT: str = EnvironmentType.DEVELOPMENT
     DATABASE_URL: str
+    # Defaults to DATABASE_URL with the async driver of the same backend
+    ASYNC_DATABASE_URL: Optional[str] = None
     RELEASE_VERSION: str = "1.0"
 
+    # Connection pool settings, shared by every request in a worker process
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_TIMEOUT: float = 30.0
+
+    # Response cache for analytics endpoints, TTLs in seconds (0 disables)
+    CACHE_MAX_ENTRIES: int = 1024
+    CACHE_TTL_REVENUE: float = 30.0
+    CACHE_TTL_SALES_ANALYSIS: float = 60.0
+
+    # Largest keyset (cursor) page the list endpoints return
+    PAGE_SIZE_MAX: int = 1000
+
+    # Largest request the inventory history answers, in days and products
+    INVENTORY_HISTORY_MAX_DAYS: int = 366
+    INVENTORY_HISTORY_MAX_PRODUCTS: int = 100
+
+    # Rows fetched from the server-side cursor per chunk of a sales export
+    SALES_EXPORT_BATCH_SIZE: int = 5000
+    # Rows per multi-row INSERT when ingesting sales in bulk
+    SALES_BULK_BATCH_SIZE: int = 1000
+
+    # Queries slower than the threshold are kept in an in-memory log, and a
+    # sample of them get their EXPLAIN plan captured (0 disables EXPLAIN)
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    SLOW_QUERY_LOG_SIZE: int = 100
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.0
+
+    # Read replicas serving the analytics queries, as a JSON list of URLs
+    # (async drivers are derived as for DATABASE_URL). A replica that fails
+    # to connect is skipped for READ_REPLICA_COOLDOWN seconds. After a
+    # client writes, its reads go to the primary for READ_YOUR_WRITES_WINDOW
+    # seconds (0 disables), so it does not read data older than its write.
+    READ_REPLICA_URLS: List[str] = []
+    READ_REPLICA_COOLDOWN: float = 30.0
+    READ_YOUR_WRITES_WINDOW: float = 5.0
+
+    # Change events pushed to dashboard clients. "memory" only reaches
+    # clients of the same worker, "redis" reaches every worker. Events a
+    # client has not received yet are buffered up to EVENTS_QUEUE_SIZE, and
+    # idle streams get a keep-alive comment every EVENTS_KEEPALIVE seconds.
+    EVENTS_BACKEND: str = "memory"
+    EVENTS_REDIS_URL: Optional[str] = None
+    EVENTS_REDIS_CHANNEL: str = "ecommerce-events"
+    EVENTS_QUEUE_SIZE: int = 100
+    EVENTS_KEEPALIVE: float = 15.0
+
+    # Router groups to mount (home, inventory, products, sales, revenue,
+    # monitoring, events) as a JSON list, all of them when unset
+    API_ROUTERS: Optional[List[str]] = None
+
+    # Server. WORKERS defaults to the number of CPUs in production and to a
+    # single reloading process otherwise. "auto" picks uvloop and httptools
+    # when they are installed.
+    SERVER_HOST: str = "127.0.0.1"
+    SERVER_PORT: int = 8000
+    WORKERS: Optional[int] = None
+    SERVER_LOOP: str = "auto"
+    SERVER_HTTP: str = "auto"
+    # Seconds an idle keep-alive connection stays open, kept above the idle
+    # timeout of the load balancer in front of the server
+    SERVER_KEEP_ALIVE: int = 75
+    SERVER_BACKLOG: int = 2048
+    # Seconds in-flight requests get to finish on shutdown
+    SERVER_GRACEFUL_SHUTDOWN_TIMEOUT: int = 30
+
     class Config:
         env_file = "./.env"
 
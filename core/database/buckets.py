@@ -0,0 +1,106 @@
+"""
+Date bucketing expressions that compile to the native functions of each
+backend, so grouping by year, month or week runs on MySQL, PostgreSQL and
+SQLite alike.
+
+Buckets are only meant for SELECT and GROUP BY. Filter date ranges on the
+plain column (``column >= start``), which keeps the predicate sargable.
+"""
+from sqlalchemy import Integer
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class DateBucket(FunctionElement):
+    type = Integer()
+    inherit_cache = True
+
+
+class year_of(DateBucket):
+    """
+    Calendar year of a date.
+    """
+
+    name = "year_of"
+    inherit_cache = True
+
+
+class month_of(DateBucket):
+    """
+    Month of a date, 1 to 12.
+    """
+
+    name = "month_of"
+    inherit_cache = True
+
+
+class week_of(DateBucket):
+    """
+    Week of the year of a date, 0 to 53, as MySQL's WEEK() in its default
+    mode: weeks start on Sunday, and days before the first Sunday of the
+    year are in week 0.
+    """
+
+    name = "week_of"
+    inherit_cache = True
+
+
+def _argument(element, compiler, **kw) -> str:
+    return compiler.process(element.clauses, **kw)
+
+
+@compiles(year_of)
+def _year_of(element, compiler, **kw):
+    return f"YEAR({_argument(element, compiler, **kw)})"
+
+
+@compiles(month_of)
+def _month_of(element, compiler, **kw):
+    return f"MONTH({_argument(element, compiler, **kw)})"
+
+
+@compiles(week_of)
+def _week_of(element, compiler, **kw):
+    return f"WEEK({_argument(element, compiler, **kw)})"
+
+
+@compiles(year_of, "postgresql")
+def _year_of_postgresql(element, compiler, **kw):
+    return f"CAST(EXTRACT(YEAR FROM {_argument(element, compiler, **kw)}) AS INTEGER)"
+
+
+@compiles(month_of, "postgresql")
+def _month_of_postgresql(element, compiler, **kw):
+    return f"CAST(EXTRACT(MONTH FROM {_argument(element, compiler, **kw)}) AS INTEGER)"
+
+
+@compiles(week_of, "postgresql")
+def _week_of_postgresql(element, compiler, **kw):
+    # Number of Sundays up to the date: (day of year + 6 - day of week) / 7,
+    # with day of year from 1 and day of week from 0 for Sunday
+    argument = _argument(element, compiler, **kw)
+    return (
+        f"CAST(FLOOR((EXTRACT(DOY FROM {argument}) + 6 "
+        f"- EXTRACT(DOW FROM {argument})) / 7) AS INTEGER)"
+    )
+
+
+@compiles(year_of, "sqlite")
+def _year_of_sqlite(element, compiler, **kw):
+    return f"CAST(strftime('%Y', {_argument(element, compiler, **kw)}) AS INTEGER)"
+
+
+@compiles(month_of, "sqlite")
+def _month_of_sqlite(element, compiler, **kw):
+    return f"CAST(strftime('%m', {_argument(element, compiler, **kw)}) AS INTEGER)"
+
+
+@compiles(week_of, "sqlite")
+def _week_of_sqlite(element, compiler, **kw):
+    # Number of Sundays up to the date, as for PostgreSQL. strftime('%U')
+    # would do, but it is only supported since SQLite 3.46.
+    argument = _argument(element, compiler, **kw)
+    return (
+        f"((CAST(strftime('%j', {argument}) AS INTEGER) + 6 "
+        f"- CAST(strftime('%w', {argument}) AS INTEGER)) / 7)"
+    )
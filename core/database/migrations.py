@@ -0,0 +1,71 @@
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+def get_alembic_config():
+    from alembic.config import Config as AlembicConfig
+
+    alembic_config = AlembicConfig(str(ALEMBIC_INI))
+    alembic_config.set_main_option(
+        "script_location", str(ALEMBIC_INI.parent / "migrations")
+    )
+    return alembic_config
+
+
+def get_head_revisions() -> set:
+    """
+    Get the head revisions of the migration scripts.
+
+    Returns:
+        set: Revision ids the database should be at.
+    """
+    from alembic.script import ScriptDirectory
+
+    return set(ScriptDirectory.from_config(get_alembic_config()).get_heads())
+
+
+def upgrade_database():
+    """
+    Apply every pending migration. Run it once per deployment, before the
+    workers start, rather than from each worker.
+    """
+    from alembic import command
+
+    command.upgrade(get_alembic_config(), "head")
+
+
+async def check_database_revision(engine: AsyncEngine):
+    """
+    Check that the database schema is at the latest migration, with a
+    single query on the alembic_version table.
+
+    Args:
+        engine (AsyncEngine): The engine of the database to check.
+
+    Raises:
+        RuntimeError: If the database is missing migrations, or is at a
+        revision the migration scripts do not know about.
+    """
+    try:
+        async with engine.connect() as connection:
+            result = await connection.execute(
+                text("SELECT version_num FROM alembic_version")
+            )
+            current = set(result.scalars().all())
+    except DBAPIError as e:
+        raise RuntimeError(
+            "Could not read the database revision, run `python migrate.py` "
+            f"first: {e}"
+        ) from e
+
+    heads = get_head_revisions()
+    if current != heads:
+        raise RuntimeError(
+            f"Database is at revision {', '.join(sorted(current)) or 'none'}, "
+            f"expected {', '.join(sorted(heads))}. Run `python migrate.py`."
+        )
@@ -0,0 +1,108 @@
+import random
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from core.config import config
+from core.metrics.metrics import DB_QUERY_DURATION
+from core.utils.utils import utcnow
+
+# Prefix that turns a SELECT into a query plan request, per dialect
+EXPLAIN_PREFIXES = {
+    "mysql": "EXPLAIN ",
+    "postgresql": "EXPLAIN ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+}
+
+
+class QueryStats:
+    """
+    Queries executed while serving one request.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, duration: float):
+        self.count += 1
+        self.total_time += duration
+        if duration > self.slowest_time:
+            self.slowest_time = duration
+            self.slowest_statement = statement
+
+
+# Stats of the request being served, set by SQLProfilingMiddleware
+request_queries: ContextVar[Optional[QueryStats]] = ContextVar(
+    "request_queries", default=None
+)
+
+# The most recent queries slower than SLOW_QUERY_THRESHOLD_MS
+slow_queries: deque = deque(maxlen=config.SLOW_QUERY_LOG_SIZE)
+
+
+def _explain(connection, statement: str, parameters) -> list[str]:
+    prefix = EXPLAIN_PREFIXES.get(connection.dialect.name)
+    if prefix is None:
+        return []
+    cursor = connection.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return [" | ".join(str(value) for value in row) for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - conn.info["query_start_time"].pop()
+    DB_QUERY_DURATION.observe(duration)
+
+    stats = request_queries.get()
+    if stats is not None:
+        stats.record(statement, duration)
+
+    if duration * 1000 < config.SLOW_QUERY_THRESHOLD_MS:
+        return
+
+    entry = {
+        "timestamp": utcnow(),
+        "duration_ms": duration * 1000,
+        "statement": statement,
+        "path": stats.path if stats is not None else None,
+        "plan": None,
+    }
+    # Sample query plans of slow SELECTs. Streaming cursors still hold their
+    # result set, so the connection cannot run another statement yet.
+    if (
+        not executemany
+        and statement.lstrip().upper().startswith("SELECT")
+        and not context.execution_options.get("stream_results")
+        and random.random() < config.SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+    ):
+        try:
+            entry["plan"] = _explain(conn, statement, parameters)
+        except Exception as e:
+            entry["plan"] = [f"EXPLAIN failed: {e}"]
+    slow_queries.append(entry)
+
+
+def instrument_engine(engine: Engine):
+    """
+    Time every statement run through the engine.
+
+    Args:
+        engine (Engine): A sync engine, or the sync_engine of an async engine.
+    """
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
@@ -1,31 +1,468 @@
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+from fastapi import Request, Response
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.pool import NullPool
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from core.config import config
-from sqlmodel import create_engine, Session
+from core.database.profiling import instrument_engine
+from core.metrics.metrics import DB_POOL_TIMEOUTS, DB_POOL_WAIT
+from sqlmodel import create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 
 database_url = config.DATABASE_URL
 
+# Async drivers used when ASYNC_DATABASE_URL is not set explicitly
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
 Base = declarative_base()
 
+# The process-wide engines. The async engine serves the API and is created on
+# application startup and disposed on shutdown, so every request reuses its
+# pool. The sync engine is only created on demand for scripts.
+engine: Optional[Engine] = None
+async_engine: Optional[AsyncEngine] = None
+async_session_factory: Optional[sessionmaker] = None
+
+# Engines of the read replicas, created along with the async engine
+replica_engines: List[AsyncEngine] = []
+replica_session_factories: List[sessionmaker] = []
+
+# Cookie holding the time of the client's last write, for read-your-writes
+LAST_WRITE_COOKIE = "last_write"
+
+
+class PoolStats:
+    """
+    Counters describing how requests acquire connections from a pool.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def record_wait(self, wait_time: float, timed_out: bool = False):
+        if timed_out:
+            self.timeouts += 1
+            DB_POOL_TIMEOUTS.labels(self.name).inc()
+        else:
+            self.checkouts += 1
+        DB_POOL_WAIT.labels(self.name).observe(wait_time)
+        self.wait_time_total += wait_time
+        self.wait_time_max = max(self.wait_time_max, wait_time)
+
+
+# Stats of each pool by name: "primary", "replica-<n>" or "sync"
+pool_stats: Dict[str, PoolStats] = {}
+
+
+def get_pool_stats(name: str) -> PoolStats:
+    if name not in pool_stats:
+        pool_stats[name] = PoolStats(name)
+    return pool_stats[name]
+
+
+class ReplicaRouter:
+    """
+    Picks the read replica of each read session in turn, skipping replicas
+    that recently failed to connect.
+    """
+
+    def __init__(self, cooldown: float):
+        self.cooldown = cooldown
+        self.replicas = 0
+        self._next = itertools.count()
+        self._unhealthy_until: dict = {}
+
+    def reset(self, replicas: int):
+        self.replicas = replicas
+        self._unhealthy_until.clear()
+
+    def candidates(self) -> List[int]:
+        """
+        Get the healthy replicas, starting from the next one in turn.
+
+        Returns:
+            List[int]: Indexes of the replicas to try, in order.
+        """
+        if not self.replicas:
+            return []
+        start = next(self._next) % self.replicas
+        now = time.monotonic()
+        return [
+            index
+            for index in (
+                (start + offset) % self.replicas for offset in range(self.replicas)
+            )
+            if self._unhealthy_until.get(index, 0.0) <= now
+        ]
+
+    def mark_unhealthy(self, index: int):
+        self._unhealthy_until[index] = time.monotonic() + self.cooldown
+
+    def is_healthy(self, index: int) -> bool:
+        return self._unhealthy_until.get(index, 0.0) <= time.monotonic()
+
+
+replica_router = ReplicaRouter(cooldown=config.READ_REPLICA_COOLDOWN)
+
+
+class InstrumentedPoolMixin:
+    """
+    Records how long callers wait for a connection from a QueuePool.
+    """
+
+    # Set on the pool of each engine, names its stats and metrics
+    name = "primary"
+
+    def _do_get(self):
+        stats = get_pool_stats(self.name)
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            stats.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        stats.record_wait(time.perf_counter() - start)
+        return connection
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def get_pool_options() -> dict:
+    """
+    Pool settings shared by the sync and async engines.
+
+    Returns:
+        dict: Keyword arguments for ``create_engine``.
+    """
+    return {
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+    }
+
+
+def to_async_url(url: str) -> str:
+    """
+    Swap the driver of a database URL for the async driver of its backend.
+
+    Args:
+        url (str): A database URL.
+
+    Returns:
+        str: The async database URL.
+    """
+    url = make_url(url)
+    drivername = ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)
+    return str(url.set(drivername=drivername))
+
+
+def get_async_database_url() -> str:
+    """
+    Get the database URL for the async engine.
+
+    ASYNC_DATABASE_URL is used when set, otherwise the driver of DATABASE_URL
+    is swapped for the async driver of the same backend.
+
+    Returns:
+        str: The async database URL.
+    """
+    if config.ASYNC_DATABASE_URL:
+        return config.ASYNC_DATABASE_URL
+
+    return to_async_url(database_url)
+
+
+def create_instrumented_async_engine(url: str, name: str) -> AsyncEngine:
+    async_engine_ = create_async_engine(
+        url,
+        echo=False,
+        poolclass=InstrumentedAsyncQueuePool,
+        **get_pool_options(),
+    )
+    async_engine_.pool.name = name
+    instrument_engine(async_engine_.sync_engine)
+    return async_engine_
+
+
+def init_engine() -> Engine:
+    """
+    Create the process-wide sync database engine if it does not exist yet.
+
+    Returns:
+        sqlalchemy.engine.Engine: The pooled database engine.
+    """
+    global engine
+    if engine is None:
+        engine = create_engine(
+            database_url,
+            echo=False,
+            poolclass=InstrumentedQueuePool,
+            **get_pool_options(),
+        )
+        engine.pool.name = "sync"
+        instrument_engine(engine)
+    return engine
+
+
+def dispose_engine():
+    """
+    Close every pooled connection and drop the process-wide sync engine.
+    """
+    global engine
+    if engine is not None:
+        engine.dispose()
+        engine = None
+
+
+def init_async_engine() -> AsyncEngine:
+    """
+    Create the process-wide async database engine, and the engines of the
+    read replicas, if they do not exist yet.
+
+    Returns:
+        sqlalchemy.ext.asyncio.AsyncEngine: The pooled async database engine.
+    """
+    global async_engine, async_session_factory
+    if async_engine is None:
+        async_engine = create_instrumented_async_engine(
+            get_async_database_url(), "primary"
+        )
+        async_session_factory = sessionmaker(
+            async_engine, class_=AsyncSession, expire_on_commit=False
+        )
+        for index, url in enumerate(config.READ_REPLICA_URLS):
+            replica_engine = create_instrumented_async_engine(
+                to_async_url(url), f"replica-{index}"
+            )
+            replica_engines.append(replica_engine)
+            replica_session_factories.append(
+                sessionmaker(
+                    replica_engine, class_=AsyncSession, expire_on_commit=False
+                )
+            )
+        replica_router.reset(len(replica_engines))
+    return async_engine
+
+
+async def dispose_async_engine():
+    """
+    Close every pooled connection and drop the process-wide async engine.
+    """
+    global async_engine, async_session_factory
+    if async_engine is not None:
+        await async_engine.dispose()
+        async_engine = None
+        async_session_factory = None
+    for replica_engine in replica_engines:
+        await replica_engine.dispose()
+    replica_engines.clear()
+    replica_session_factories.clear()
+
 
 def get_connection():
     """
-    Create a database connection.
+    Get the process-wide sync database engine, used by scripts.
 
     Returns:
-        sqlmodel.Database: A database connection.
+        sqlalchemy.engine.Engine: The pooled database engine.
     """
-    return create_engine(database_url, echo=False, poolclass=NullPool)
+    return init_engine()
 
 
-def get_session():
+def get_async_pools() -> list:
+    """
+    Get the pools of the primary and replica async engines, once created.
+
+    Returns:
+        list: The instrumented pools, primary first.
     """
-    Get a database session.
+    if async_engine is None:
+        return []
+    return [async_engine.pool, *(engine_.pool for engine_ in replica_engines)]
+
+
+def get_pool_status() -> List[dict]:
+    """
+    Report the state of each connection pool that serves the API.
+
+    Returns:
+        List[dict]: Name, pool size, checked in/out connections, overflow,
+        checkouts, timeouts and the time spent waiting for a connection of
+        the primary's pool, then of each replica's.
+    """
+    init_async_engine()
+    status = []
+    for pool in get_async_pools():
+        stats = get_pool_stats(pool.name)
+        average_wait = (
+            stats.wait_time_total / stats.checkouts if stats.checkouts else 0.0
+        )
+        status.append(
+            {
+                "name": pool.name,
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "checkouts": stats.checkouts,
+                "timeouts": stats.timeouts,
+                "wait_time_total": stats.wait_time_total,
+                "wait_time_avg": average_wait,
+                "wait_time_max": stats.wait_time_max,
+            }
+        )
+    return status
+
+
+def new_session() -> AsyncSession:
+    """
+    Open a new async session on its own connection.
+
+    Returns:
+        sqlmodel.ext.asyncio.session.AsyncSession: A database session.
+    """
+    init_async_engine()
+    return async_session_factory()
+
+
+async def get_session():
+    """
+    Get an async database session.
 
     Yields:
-        sqlmodel.Session: A database session.
+        sqlmodel.ext.asyncio.session.AsyncSession: A database session.
     """
-    with Session(get_connection()) as session:
+    async with new_session() as session:
         yield session
+
+
+async def open_read_session(primary: bool = False) -> AsyncSession:
+    """
+    Open a session on a healthy read replica, or on the primary when there
+    is none or primary is set.
+
+    The session connects right away, through the pre-ping of the pool, so a
+    replica that is down is detected here, skipped for READ_REPLICA_COOLDOWN
+    seconds and the next one is tried.
+
+    Args:
+        primary (bool): Read from the primary, e.g. right after a write.
+
+    Returns:
+        sqlmodel.ext.asyncio.session.AsyncSession: A database session.
+    """
+    init_async_engine()
+    if not primary:
+        for index in replica_router.candidates():
+            session = replica_session_factories[index]()
+            try:
+                await session.connection()
+            except (DBAPIError, OSError):
+                await session.close()
+                replica_router.mark_unhealthy(index)
+                continue
+            return session
+    return async_session_factory()
+
+
+@asynccontextmanager
+async def read_session(primary: bool = False):
+    """
+    Open a read session for code running outside a request.
+
+    Args:
+        primary (bool): Read from the primary, e.g. when the request that
+            started the code used wrote_recently to route its reads.
+
+    Yields:
+        sqlmodel.ext.asyncio.session.AsyncSession: A database session.
+    """
+    session = await open_read_session(primary)
+    async with session:
+        yield session
+
+
+def wrote_recently(request: Request) -> bool:
+    """
+    Check whether the client wrote within READ_YOUR_WRITES_WINDOW seconds.
+    """
+    if config.READ_YOUR_WRITES_WINDOW <= 0:
+        return False
+    try:
+        last_write = float(request.cookies.get(LAST_WRITE_COOKIE, ""))
+    except ValueError:
+        return False
+    return time.time() - last_write < config.READ_YOUR_WRITES_WINDOW
+
+
+async def get_read_session(request: Request):
+    """
+    Get a database session for read-only queries, on a read replica unless
+    the client wrote recently.
+
+    Yields:
+        sqlmodel.ext.asyncio.session.AsyncSession: A database session.
+    """
+    session = await open_read_session(primary=wrote_recently(request))
+    async with session:
+        yield session
+
+
+async def get_write_session(response: Response):
+    """
+    Get a database session on the primary for requests that write, and start
+    the client's read-your-writes window.
+
+    Yields:
+        sqlmodel.ext.asyncio.session.AsyncSession: A database session.
+    """
+    if config.READ_YOUR_WRITES_WINDOW > 0 and replica_engines:
+        response.set_cookie(
+            LAST_WRITE_COOKIE,
+            str(time.time()),
+            max_age=int(config.READ_YOUR_WRITES_WINDOW) + 1,
+            httponly=True,
+            samesite="lax",
+        )
+    async with new_session() as session:
+        yield session
+
+
+def get_replica_status() -> List[dict]:
+    """
+    Report whether each read replica is currently used.
+
+    Returns:
+        List[dict]: host and healthy of each replica, in configuration order.
+    """
+    init_async_engine()
+    return [
+        {"host": replica_engine.url.host, "healthy": replica_router.is_healthy(index)}
+        for index, replica_engine in enumerate(replica_engines)
+    ]
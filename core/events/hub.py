@@ -0,0 +1,160 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from core.config import config
+
+# Topics published by the repositories
+INVENTORY_TOPIC = "inventory"
+SALES_TOPIC = "sales"
+
+
+class Subscription:
+    """
+    Events queued for one client. When the client falls behind by more than
+    the queue size, its queue is replaced by a single None, which tells the
+    client to reload the state instead of applying the missing deltas.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    def put(self, event: Optional[dict]):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class MemoryBackend:
+    """
+    Delivers events to the subscribers of this process only.
+    """
+
+    def __init__(self):
+        self.deliver = None
+
+    async def start(self, deliver):
+        self.deliver = deliver
+
+    async def stop(self):
+        self.deliver = None
+
+    async def publish(self, event: dict):
+        if self.deliver is not None:
+            self.deliver(event)
+
+
+class RedisBackend:
+    """
+    Delivers events to the subscribers of every worker through a Redis
+    pub/sub channel. Needs the optional redis package.
+    """
+
+    def __init__(self, url: str, channel: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError(
+                "EVENTS_BACKEND=redis needs the redis package installed"
+            ) from e
+        self.redis = redis.from_url(url)
+        self.channel = channel
+        self.listener: Optional[asyncio.Task] = None
+
+    async def start(self, deliver):
+        pubsub = self.redis.pubsub()
+        await pubsub.subscribe(self.channel)
+        self.listener = asyncio.create_task(self._listen(pubsub, deliver))
+
+    async def _listen(self, pubsub, deliver):
+        try:
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    deliver(json.loads(message["data"]))
+        finally:
+            await pubsub.close()
+
+    async def stop(self):
+        if self.listener is not None:
+            self.listener.cancel()
+            try:
+                await self.listener
+            except asyncio.CancelledError:
+                pass
+        await self.redis.close()
+
+    async def publish(self, event: dict):
+        await self.redis.publish(self.channel, json.dumps(event, default=str))
+
+
+class EventHub:
+    """
+    Fans out change events to the subscribed clients of this process.
+
+    Events go through the backend, so with a shared backend a change made by
+    one worker reaches the clients connected to any worker.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self.backend = None
+        self._subscriptions: set = set()
+
+    async def start(self):
+        if config.EVENTS_BACKEND == "redis":
+            self.backend = RedisBackend(
+                config.EVENTS_REDIS_URL, config.EVENTS_REDIS_CHANNEL
+            )
+        elif config.EVENTS_BACKEND == "memory":
+            self.backend = MemoryBackend()
+        else:
+            raise ValueError(f"Unknown events backend: {config.EVENTS_BACKEND}")
+        await self.backend.start(self._deliver)
+
+    async def stop(self):
+        if self.backend is not None:
+            await self.backend.stop()
+            self.backend = None
+
+    def _deliver(self, event: dict):
+        for subscription in self._subscriptions:
+            subscription.put(event)
+
+    async def publish(self, topic: str, data: dict):
+        """
+        Send an event to the subscribers of every worker.
+
+        Args:
+            topic: INVENTORY_TOPIC or SALES_TOPIC.
+            data: JSON serializable payload.
+        """
+        if self.backend is not None and self._has_listeners():
+            await self.backend.publish({"topic": topic, "data": data})
+
+    def _has_listeners(self) -> bool:
+        # Other workers may have subscribers behind a shared backend
+        return bool(self._subscriptions) or not isinstance(
+            self.backend, MemoryBackend
+        )
+
+    @asynccontextmanager
+    async def subscribe(self):
+        """
+        Receive the events published while the context is open.
+
+        Yields:
+            Subscription: The queue of events for this client.
+        """
+        subscription = Subscription(self.queue_size)
+        self._subscriptions.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscriptions.discard(subscription)
+
+
+event_hub = EventHub(queue_size=config.EVENTS_QUEUE_SIZE)
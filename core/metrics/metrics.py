@@ -0,0 +1,112 @@
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.requests import Request
+from starlette.responses import Response
+
+# With several workers, PROMETHEUS_MULTIPROC_DIR must point every worker to
+# the same empty directory before they start. Each worker then writes its
+# samples to memory-mapped files there, and a scrape of any worker
+# aggregates all of them. Updating a sample only takes an uncontended
+# per-value lock, so collection stays cheap on the request path.
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by method, route template and status.",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method, route template and status.",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests being served.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Duration of SQL statements.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting for a connection, by pool.",
+    ["pool"],
+    buckets=(0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total",
+    "Connection checkouts that timed out waiting, by pool.",
+    ["pool"],
+)
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Configured size of the connection pool, by pool.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out, by pool.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections open beyond the pool size, by pool.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+
+CACHE_REQUESTS = Counter(
+    "response_cache_requests_total",
+    "Response cache lookups by result (hit, miss or coalesced).",
+    ["result"],
+)
+CACHE_EVICTIONS = Counter(
+    "response_cache_evictions_total",
+    "Response cache entries evicted to stay within capacity.",
+)
+
+
+def update_pool_metrics(pool):
+    """
+    Record the current state of an instrumented QueuePool.
+    """
+    DB_POOL_SIZE.labels(pool.name).set(pool.size())
+    DB_POOL_CHECKED_OUT.labels(pool.name).set(pool.checkedout())
+    DB_POOL_OVERFLOW.labels(pool.name).set(max(pool.overflow(), 0))
+
+
+def mark_process_dead():
+    """
+    Drop the live gauges of this worker when it shuts down.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+async def metrics(request: Request) -> Response:
+    """
+    Serve the metrics of every worker in the Prometheus text format.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,44 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.database.profiling import QueryStats, request_queries
+
+
+class SQLProfilingMiddleware:
+    """
+    Count the queries of each request and report them in a Server-Timing
+    header: the number of queries and total database time, the slowest
+    query, and the total time spent in the application.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(path=scope["path"])
+        token = request_queries.set(stats)
+        start = time.perf_counter()
+
+        async def send_with_timing(message: Message):
+            if message["type"] == "http.response.start":
+                total = (time.perf_counter() - start) * 1000
+                db_time = stats.total_time * 1000
+                slowest = stats.slowest_time * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={db_time:.2f};desc="{stats.count} queries", '
+                    f"db-slowest;dur={slowest:.2f}, app;dur={total:.2f}",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_queries.reset(token)
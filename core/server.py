@@ -1,32 +1,52 @@
+from contextlib import asynccontextmanager
 from typing import List
 
 from fastapi import FastAPI
 from fastapi.middleware import Middleware
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api import router
+from app.api import get_router
+from core.cache.etag import NotModified, not_modified_handler
 from core.config import config
-from core.database.create_db import validate_database
-from core.utils.utils import run_alembic_upgrade
+from core.database.migrations import check_database_revision
+from core.database.session import dispose_async_engine, init_async_engine
+from core.events.hub import event_hub
+from core.metrics.metrics import mark_process_dead, metrics
+from core.middlewares.metrics import MetricsMiddleware
+from core.middlewares.sql_profiling import SQLProfilingMiddleware
 
 
 def init_routers(app_: FastAPI) -> None:
-    app_.include_router(router)
+    app_.include_router(get_router(config.API_ROUTERS))
+    app_.add_route("/metrics", metrics, include_in_schema=False)
 
 
-def init_db():
-    validate_database()
+@asynccontextmanager
+async def lifespan(app_: FastAPI):
+    # One pooled engine per worker process, shared by every request
+    engine = init_async_engine()
+    # Migrations are applied by migrate.py before deploying, workers only
+    # refuse to serve a schema they were not written for
+    await check_database_revision(engine)
+    await event_hub.start()
+    yield
+    await event_hub.stop()
+    await dispose_async_engine()
+    mark_process_dead()
 
 
 def make_middleware() -> List[Middleware]:
     middleware = [
+        Middleware(MetricsMiddleware),
         Middleware(
             CORSMiddleware,
             allow_origins=["*"],
             allow_credentials=True,
             allow_methods=["*"],
             allow_headers=["*"],
+            expose_headers=["ETag", "Server-Timing"],
         ),
+        Middleware(SQLProfilingMiddleware),
     ]
     return middleware
 
@@ -39,9 +59,9 @@ def create_app() -> FastAPI:
         docs_url=None if config.ENVIRONMENT == "production" else "/docs",
         redoc_url=None if config.ENVIRONMENT == "production" else "/redoc",
         middleware=make_middleware(),
+        exception_handlers={NotModified: not_modified_handler},
+        lifespan=lifespan,
     )
-    init_db()
-    run_alembic_upgrade()
     init_routers(app_=app_)
     return app_
 
@@ -1,4 +1,5 @@
-import subprocess
+import base64
+import json
 from datetime import datetime, timezone
 
 
@@ -37,9 +38,38 @@ def get_month_abbr(month):
     return month_abbr[month - 1] if 1 <= month <= 12 else ""
 
 
-def run_alembic_upgrade():
+def encode_cursor(position: dict) -> str:
+    """
+    Encode a keyset pagination position as an opaque cursor.
+
+    Args:
+        position (dict): Values of the sort key of the last returned row.
+
+    Returns:
+        str: URL-safe cursor string.
+    """
+    payload = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor (str): The cursor string.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+
+    Returns:
+        dict: The encoded position.
+    """
+    padding = "=" * (-len(cursor) % 4)
     try:
-        # Use subprocess to run Alembic upgrade
-        subprocess.run(["alembic", "upgrade", "head"])
-    except Exception as e:
-        print(f"Error running Alembic upgrade: {str(e)}")
+        position = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(position, dict):
+        raise ValueError("Invalid cursor")
+    return position
@@ -1,68 +1,275 @@
-from datetime import datetime
-from random import randint, uniform, choice
+import argparse
+import multiprocessing
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
 from faker import Faker
-from sqlalchemy.orm import Session
-from app.models.models import Product, Category, Sale, Inventory
+from sqlalchemy import insert, select
+from sqlalchemy.engine import Connection
+
+from app.models.models import (
+    Product,
+    Category,
+    Sale,
+    Inventory,
+    InventoryMovement,
+)
+from app.repository.rollup import rebuild_rollup_statements
 from core.database.session import get_connection
 from core.database.create_db import validate_database
-from core.utils.utils import run_alembic_upgrade
+from core.database.migrations import upgrade_database
 
 fake = Faker()
 
 
-def create_demo_data(session: Session,
-                     num_categories: int,
-                     num_products: int,
-                     num_sales: int):
-    categories = []
-    for _ in range(num_categories):
-        category = Category(name=fake.word())
-        session.add(category)
-        session.commit()
-        categories.append(category)
-
-    products = []
-    for _ in range(num_products):
-        category = choice(categories)
-        product = Product(
-            name=fake.word(),
-            description=fake.sentence(),
-            price=uniform(10, 200),
-            category_id=category.id,
-        )
-        session.add(product)
-        session.commit()
-        products.append(product)
-
-    for _ in range(num_sales):
-        product = choice(products)
-        sale = Sale(
-            date=fake.date_between(start_date='-2y', end_date='today'),
-            quantity=randint(1, 10),
-            revenue=uniform(10, 200),
-            product_id=product.id,
+def create_catalog(
+    connection: Connection,
+    rng: np.random.Generator,
+    num_categories: int,
+    num_products: int,
+):
+    """
+    Bulk insert categories, products and one inventory row per product.
+
+    Returns:
+        tuple: Product IDs and their prices, as NumPy arrays.
+    """
+    connection.execute(
+        insert(Category.__table__),
+        [{"name": fake.word()} for _ in range(num_categories)],
+    )
+    category_ids = np.array(
+        connection.execute(select(Category.id).order_by(Category.id)).scalars().all()
+    )[-num_categories:]
+
+    prices = np.round(rng.uniform(10, 200, num_products), 2)
+    product_categories = rng.choice(category_ids, num_products)
+    connection.execute(
+        insert(Product.__table__),
+        [
+            {
+                "name": fake.word(),
+                "description": fake.sentence(),
+                "price": float(price),
+                "category_id": int(category_id),
+            }
+            for price, category_id in zip(prices, product_categories)
+        ],
+    )
+    product_ids = np.array(
+        connection.execute(select(Product.id).order_by(Product.id)).scalars().all()
+    )[-num_products:]
+
+    quantities = rng.integers(1, 51, num_products)
+    connection.execute(
+        insert(Inventory.__table__),
+        [
+            {
+                "product_id": int(product_id),
+                "quantity": int(quantity),
+                "date": date.today(),
+            }
+            for product_id, quantity in zip(product_ids, quantities)
+        ],
+    )
+    # Open the inventory ledger with the initial stock levels
+    now = datetime.utcnow()
+    connection.execute(
+        insert(InventoryMovement.__table__),
+        [
+            {
+                "product_id": int(product_id),
+                "ts": now,
+                "quantity_change": int(quantity),
+                "quantity_after": int(quantity),
+            }
+            for product_id, quantity in zip(product_ids, quantities)
+        ],
+    )
+    return product_ids, prices
+
+
+def product_weights(num_products: int, zipf: float, rng: np.random.Generator):
+    """
+    Probability of each product being sold.
+
+    Product popularity follows a Zipf distribution with exponent zipf (0 gives
+    a uniform distribution). The popularity ranks are shuffled so the best
+    sellers are not simply the first products.
+    """
+    weights = 1.0 / np.arange(1, num_products + 1) ** zipf
+    rng.shuffle(weights)
+    return weights / weights.sum()
+
+
+def generate_sales(
+    rng: np.random.Generator,
+    count: int,
+    product_ids: np.ndarray,
+    prices: np.ndarray,
+    weights: np.ndarray,
+    start_date: date,
+    end_date: date,
+) -> list[dict]:
+    """
+    Generate a batch of random sales with vectorized draws.
+
+    Returns:
+        list[dict]: Sale rows ready for an executemany INSERT.
+    """
+    days = (end_date - start_date).days + 1
+    dates = (
+        np.datetime64(start_date) + rng.integers(0, days, count).astype("timedelta64[D]")
+    ).astype(object)
+    products = rng.choice(len(product_ids), count, p=weights)
+    quantities = rng.integers(1, 11, count)
+    revenues = np.round(quantities * prices[products], 2)
+
+    return [
+        {
+            "date": sale_date,
+            "quantity": int(quantity),
+            "revenue": float(revenue),
+            "product_id": int(product_id),
+        }
+        for sale_date, quantity, revenue, product_id in zip(
+            dates, quantities, revenues, product_ids[products]
         )
-        session.add(sale)
-        session.commit()
-
-    for product in products:
-        inventory = Inventory(
-            product_id=product.id,
-            quantity=randint(1, 50),
-            date=datetime.now(),
+    ]
+
+
+def insert_sales(task: dict) -> int:
+    """
+    Generate and insert a share of the sales. Runs in a worker process, with
+    its own engine and random stream.
+
+    Returns:
+        int: Number of inserted sales.
+    """
+    rng = np.random.default_rng(task["seed"])
+    weights = product_weights(len(task["product_ids"]), task["zipf"], rng)
+    remaining = task["count"]
+
+    with get_connection().connect() as connection:
+        while remaining > 0:
+            count = min(task["batch_size"], remaining)
+            rows = generate_sales(
+                rng,
+                count,
+                task["product_ids"],
+                task["prices"],
+                weights,
+                task["start_date"],
+                task["end_date"],
+            )
+            connection.execute(insert(Sale.__table__), rows)
+            connection.commit()
+            remaining -= count
+
+    return task["count"]
+
+
+def create_demo_data(
+    num_categories: int,
+    num_products: int,
+    num_sales: int,
+    start_date: date,
+    end_date: date,
+    zipf: float = 1.1,
+    seed: int = 42,
+    batch_size: int = 10_000,
+    workers: int = 1,
+):
+    """
+    Populate the database with a reproducible dataset.
+
+    Sales are split across worker processes, each generating and inserting
+    its share in batches of batch_size rows. The daily sales rollup is
+    rebuilt once all sales are in.
+    """
+    Faker.seed(seed)
+    seed_sequence = np.random.SeedSequence(seed)
+    catalog_seed, *worker_seeds = seed_sequence.spawn(workers + 1)
+
+    with get_connection().begin() as connection:
+        product_ids, prices = create_catalog(
+            connection, np.random.default_rng(catalog_seed), num_categories, num_products
         )
-        session.add(inventory)
 
-    session.commit()
+    shares = [num_sales // workers + (i < num_sales % workers) for i in range(workers)]
+    tasks = [
+        {
+            "seed": worker_seed,
+            "count": share,
+            "product_ids": product_ids,
+            "prices": prices,
+            "zipf": zipf,
+            "start_date": start_date,
+            "end_date": end_date,
+            "batch_size": batch_size,
+        }
+        for worker_seed, share in zip(worker_seeds, shares)
+    ]
+
+    if workers == 1:
+        inserted = insert_sales(tasks[0])
+    else:
+        # Spawn, so each worker builds its own engine instead of inheriting
+        # the parent's pooled connections
+        with multiprocessing.get_context("spawn").Pool(workers) as pool:
+            inserted = sum(pool.map(insert_sales, tasks))
+
+    with get_connection().begin() as connection:
+        for statement in rebuild_rollup_statements():
+            connection.execute(statement)
+
+    return inserted
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Populate the database with demo data.")
+    parser.add_argument("--categories", type=int, default=5)
+    parser.add_argument("--products", type=int, default=20)
+    parser.add_argument("--sales", type=int, default=100)
+    parser.add_argument(
+        "--start-date",
+        type=date.fromisoformat,
+        default=date.today() - timedelta(days=730),
+    )
+    parser.add_argument("--end-date", type=date.fromisoformat, default=date.today())
+    parser.add_argument(
+        "--zipf",
+        type=float,
+        default=1.1,
+        help="Exponent of the product popularity skew, 0 for uniform sales.",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=1)
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    num_categories = 5
-    num_products = 20
-    num_sales = 100
+    args = parse_args()
 
     validate_database()  # create db it does not exist
-    run_alembic_upgrade()  # create the tables
-    with Session(get_connection()) as db:
-        create_demo_data(db, num_categories, num_products, num_sales)
-        print("Demo data populated successfully.")
+    upgrade_database()  # create the tables
+
+    started = time.perf_counter()
+    inserted = create_demo_data(
+        num_categories=args.categories,
+        num_products=args.products,
+        num_sales=args.sales,
+        start_date=args.start_date,
+        end_date=args.end_date,
+        zipf=args.zipf,
+        seed=args.seed,
+        batch_size=args.batch_size,
+        workers=args.workers,
+    )
+    elapsed = time.perf_counter() - started
+    print(
+        f"Demo data populated successfully: {inserted} sales in {elapsed:.1f}s "
+        f"({inserted / elapsed:.0f} rows/s)."
+    )
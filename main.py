@@ -1,10 +1,39 @@
+import os
+
 import uvicorn
-from core.config import config
+from core.config import EnvironmentType, config
+
+
+def get_workers() -> int:
+    """
+    Get the number of worker processes to run.
+
+    Returns:
+        int: WORKERS when set, otherwise one per CPU in production and a
+        single process elsewhere.
+    """
+    if config.WORKERS:
+        return config.WORKERS
+    if config.ENVIRONMENT == EnvironmentType.PRODUCTION:
+        return os.cpu_count() or 1
+    return 1
 
 
 if __name__ == "__main__":
+    workers = get_workers()
+    # Workers are separate processes that each import the app and create
+    # their own connection pool on startup, so no connection is shared
+    # across processes. On shutdown every worker stops accepting connections,
+    # lets in-flight requests finish and then disposes its pool.
     uvicorn.run(
         app="core.server:app",
-        reload=True if config.ENVIRONMENT != "production" else False,
-        workers=1,
+        host=config.SERVER_HOST,
+        port=config.SERVER_PORT,
+        reload=config.ENVIRONMENT != EnvironmentType.PRODUCTION and workers == 1,
+        workers=workers,
+        loop=config.SERVER_LOOP,
+        http=config.SERVER_HTTP,
+        timeout_keep_alive=config.SERVER_KEEP_ALIVE,
+        backlog=config.SERVER_BACKLOG,
+        timeout_graceful_shutdown=config.SERVER_GRACEFUL_SHUTDOWN_TIMEOUT,
     )
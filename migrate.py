@@ -0,0 +1,8 @@
+from core.database.create_db import validate_database
+from core.database.migrations import upgrade_database
+
+
+if __name__ == "__main__":
+    validate_database()  # create db it does not exist
+    upgrade_database()
+    print("Database migrated successfully.")
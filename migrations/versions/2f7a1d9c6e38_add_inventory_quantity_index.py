@@ -0,0 +1,30 @@
+"""add inventory quantity index
+
+Revision ID: 2f7a1d9c6e38
+Revises: 9b3e6f20c4d1
+Create Date: 2026-10-18 15:26:09.331870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2f7a1d9c6e38"
+down_revision: Union[str, None] = "9b3e6f20c4d1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_inventory_quantity_product",
+        "inventory",
+        ["quantity", "product_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_inventory_quantity_product", table_name="inventory")
@@ -0,0 +1,49 @@
+"""create daily sales rollup
+
+Revision ID: 5d2a7c81e4b0
+Revises: 14f38a03a25a
+Create Date: 2026-10-18 10:12:31.418204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5d2a7c81e4b0"
+down_revision: Union[str, None] = "14f38a03a25a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "daily_sales_rollup",
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.Float(), nullable=False),
+        sa.Column("sale_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["product_id"],
+            ["products.id"],
+        ),
+        sa.PrimaryKeyConstraint("date", "product_id"),
+    )
+    op.create_index(
+        "idx_rollup_product_id", "daily_sales_rollup", ["product_id"], unique=False
+    )
+    # Backfill the rollup from the existing sales
+    op.execute(
+        "INSERT INTO daily_sales_rollup "
+        "(date, product_id, quantity, revenue, sale_count) "
+        "SELECT date, product_id, SUM(quantity), SUM(revenue), COUNT(*) "
+        "FROM sales GROUP BY date, product_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_rollup_product_id", table_name="daily_sales_rollup")
+    op.drop_table("daily_sales_rollup")
@@ -0,0 +1,51 @@
+"""create inventory movements
+
+Revision ID: 9b3e6f20c4d1
+Revises: 5d2a7c81e4b0
+Create Date: 2026-10-18 14:02:47.905113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9b3e6f20c4d1"
+down_revision: Union[str, None] = "5d2a7c81e4b0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "inventory_movements",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("ts", sa.DateTime(), nullable=False),
+        sa.Column("quantity_change", sa.Integer(), nullable=False),
+        sa.Column("quantity_after", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["product_id"],
+            ["products.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "idx_movement_product_ts",
+        "inventory_movements",
+        ["product_id", "ts"],
+        unique=False,
+    )
+    # Open the ledger with the current stock levels
+    op.execute(
+        "INSERT INTO inventory_movements "
+        "(product_id, ts, quantity_change, quantity_after) "
+        "SELECT product_id, date, quantity, quantity FROM inventory"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_movement_product_ts", table_name="inventory_movements")
+    op.drop_table("inventory_movements")
@@ -0,0 +1,76 @@
+"""unique inventory product
+
+Revision ID: c83d5e1a7b42
+Revises: 2f7a1d9c6e38
+Create Date: 2026-10-18 18:12:40.517302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c83d5e1a7b42"
+down_revision: Union[str, None] = "2f7a1d9c6e38"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Merge the inventory rows of each product into its first row, whose
+    # quantity becomes the stock of all of them. The ledger was opened with
+    # one movement per row, so a movement bringing each merged product to
+    # its total is appended, at the time of its last movement.
+    connection = op.get_bind()
+    duplicates = connection.execute(
+        sa.text(
+            "SELECT product_id, MIN(id) AS first_id, SUM(quantity) AS quantity, "
+            "MAX(date) AS date FROM inventory "
+            "GROUP BY product_id HAVING COUNT(*) > 1"
+        )
+    ).all()
+    for row in duplicates:
+        connection.execute(
+            sa.text(
+                "UPDATE inventory SET quantity = :quantity, date = :date WHERE id = :id"
+            ),
+            {"quantity": row.quantity, "date": row.date, "id": row.first_id},
+        )
+        connection.execute(
+            sa.text(
+                "DELETE FROM inventory WHERE product_id = :product_id AND id <> :id"
+            ),
+            {"product_id": row.product_id, "id": row.first_id},
+        )
+        last = connection.execute(
+            sa.text(
+                "SELECT ts, quantity_after FROM inventory_movements "
+                "WHERE product_id = :product_id ORDER BY ts DESC, id DESC LIMIT 1"
+            ),
+            {"product_id": row.product_id},
+        ).first()
+        previous = last.quantity_after if last is not None else 0
+        if previous == row.quantity:
+            continue
+        connection.execute(
+            sa.text(
+                "INSERT INTO inventory_movements "
+                "(product_id, ts, quantity_change, quantity_after) "
+                "VALUES (:product_id, :ts, :quantity_change, :quantity)"
+            ),
+            {
+                "product_id": row.product_id,
+                "ts": last.ts if last is not None else row.date,
+                "quantity_change": row.quantity - previous,
+                "quantity": row.quantity,
+            },
+        )
+
+    op.create_index("uq_inventory_product", "inventory", ["product_id"], unique=True)
+
+
+def downgrade() -> None:
+    # Merged rows stay merged, their total stock is still correct
+    op.drop_index("uq_inventory_product", table_name="inventory")
@@ -0,0 +1,46 @@
+import json
+import os
+import tempfile
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+# Set before core.config is first imported
+DATABASE_PATH = Path(tempfile.mkdtemp()) / "test.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{DATABASE_PATH}"
+# A replica sharing the primary's database, and one that cannot connect
+os.environ["READ_REPLICA_URLS"] = json.dumps(
+    [f"sqlite:///{DATABASE_PATH}", "sqlite:////nonexistent/replica.db"]
+)
+os.environ["ENVIRONMENT"] = "test"
+os.environ["CACHE_TTL_REVENUE"] = "0"
+os.environ["CACHE_TTL_SALES_ANALYSIS"] = "0"
+
+START_DATE = date(2021, 1, 1)
+END_DATE = date(2023, 12, 31)
+
+
+@pytest.fixture(scope="session")
+def client():
+    """
+    A client of the app, on a migrated SQLite database seeded with a small
+    demo dataset.
+    """
+    from fastapi.testclient import TestClient
+
+    from core.database.migrations import upgrade_database
+    from core.server import app
+    from demo_data import create_demo_data
+
+    upgrade_database()
+    create_demo_data(
+        num_categories=3,
+        num_products=20,
+        num_sales=2000,
+        start_date=START_DATE,
+        end_date=END_DATE,
+        seed=1,
+    )
+    with TestClient(app) as client:
+        yield client
@@ -0,0 +1,38 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import Column, Date, MetaData, Table, create_engine, select
+
+from core.database.buckets import month_of, week_of, year_of
+
+# Two years around a year starting on a Sunday (2023) and a leap year (2024)
+DATES = [date(2022, 12, 1) + timedelta(days=days) for days in range(800)]
+
+
+days = Table("days", MetaData(), Column("day", Date, primary_key=True))
+
+
+@pytest.fixture(scope="module")
+def sqlite():
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        days.create(connection)
+        connection.execute(days.insert(), [{"day": day} for day in DATES])
+        yield connection
+    engine.dispose()
+
+
+def buckets(connection, function) -> list:
+    query = select(days.c.day, function(days.c.day)).order_by(days.c.day)
+    return connection.execute(query).all()
+
+
+def test_year_and_month_on_sqlite(sqlite):
+    assert all(year == day.year for day, year in buckets(sqlite, year_of))
+    assert all(month == day.month for day, month in buckets(sqlite, month_of))
+
+
+def test_week_on_sqlite_matches_sunday_weeks(sqlite):
+    # The revenue series key weeks with %U, as MySQL's WEEK() in mode 0
+    for day, week in buckets(sqlite, week_of):
+        assert week == int(day.strftime("%U")), day
@@ -0,0 +1,86 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import insert
+
+from app.models.models import DailySalesRollup, Sale
+from core.config import config
+from core.database.session import get_connection
+
+# Routes answering conditional GETs, most of them versioned by a single table
+CONDITIONAL_ROUTES = [
+    ("/v1/inventory/", {}),
+    ("/v1/inventory/summary", {}),
+    ("/v1/products/", {}),
+    ("/v1/revenue/annual", {"years": 6}),
+    ("/v1/revenue/products", {"product_ids": [1, 2]}),
+]
+
+
+@pytest.mark.parametrize("path, params", CONDITIONAL_ROUTES)
+def test_conditional_get(client, path, params):
+    response = client.get(path, params=params)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    response = client.get(path, params=params, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+
+def test_etag_changes_with_params(client):
+    first = client.get("/v1/products/", params={"limit": 5})
+    second = client.get("/v1/products/", params={"limit": 6})
+    assert first.headers["ETag"] != second.headers["ETag"]
+
+    response = client.get(
+        "/v1/products/",
+        params={"limit": 6},
+        headers={"If-None-Match": first.headers["ETag"]},
+    )
+    assert response.status_code == 200
+
+
+def test_etag_changes_after_write(client):
+    etag = client.get("/v1/inventory/summary").headers["ETag"]
+    response = client.post(
+        "/v1/inventory/update", json={"product_id": 1, "quantity_change": 1}
+    )
+    assert response.status_code == 200
+
+    response = client.get("/v1/inventory/summary", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_cached_body_follows_etag_after_write_elsewhere(client, monkeypatch):
+    monkeypatch.setattr(config, "CACHE_TTL_REVENUE", 60.0)
+    params = {"start_date": "2020-06-01", "end_date": "2020-06-30"}
+    first = client.get("/v1/revenue/timeperiod", params=params)
+
+    # Written by another worker, whose cache invalidation this one never sees
+    with get_connection().begin() as connection:
+        connection.execute(
+            insert(Sale.__table__),
+            {"date": date(2020, 6, 1), "quantity": 1, "revenue": 10.0, "product_id": 1},
+        )
+        connection.execute(
+            insert(DailySalesRollup.__table__),
+            {
+                "date": date(2020, 6, 1),
+                "product_id": 1,
+                "quantity": 1,
+                "revenue": 10.0,
+                "sale_count": 1,
+            },
+        )
+
+    second = client.get(
+        "/v1/revenue/timeperiod",
+        params=params,
+        headers={"If-None-Match": first.headers["ETag"]},
+    )
+    assert second.status_code == 200
+    assert second.headers["ETag"] != first.headers["ETag"]
+    assert second.json()["total_revenue"] == first.json()["total_revenue"] + 10.0
@@ -0,0 +1,40 @@
+from datetime import date, timedelta
+
+from app.repository.events import filter_event
+from app.schemas.requests.revenue import RevenueGranularity
+from core.events.hub import SALES_TOPIC
+from tests.conftest import START_DATE
+
+# Around a Sunday, and across a new year starting on a Sunday (2023)
+DAYS = [date(2022, 6, 4) + timedelta(days=days) for days in range(3)] + [
+    date(2022, 12, 30) + timedelta(days=days) for days in range(4)
+]
+
+
+def test_weekly_deltas_use_the_weeks_of_the_weekly_endpoint(client):
+    weeks = (date.today() - START_DATE).days // 7 + 1
+    columns = client.get(
+        "/v1/revenue/weekly",
+        params={"weeks": weeks, "dense": "true", "format": "columns"},
+    ).json()
+    week_starts = [date.fromisoformat(day) for day in columns["dates"]]
+
+    for day in DAYS:
+        event = {
+            "topic": SALES_TOPIC,
+            "data": {
+                "sales": [
+                    {
+                        "date": day.isoformat(),
+                        "product_id": 1,
+                        "quantity": 1,
+                        "revenue": 1.0,
+                    }
+                ]
+            },
+        }
+        _, data = filter_event(event, None, None, RevenueGranularity.WEEK)
+
+        # The endpoint dates each week by its first day
+        expected = max(start for start in week_starts if start <= day)
+        assert data["periods"][0]["period"] == expected.isoformat(), day
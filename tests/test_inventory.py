@@ -0,0 +1,68 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+from app.models.models import Inventory
+from core.config import config
+from core.database.session import get_connection
+
+
+@pytest.fixture
+def product_id(client) -> int:
+    # A new product has no inventory row yet
+    response = client.post(
+        "/v1/products/register",
+        json={"name": "test", "description": "test", "price": 1.0, "category_id": 1},
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_bulk_update_creates_then_increments(client, product_id):
+    updates = [
+        {"product_id": product_id, "quantity_change": 5},
+        {"product_id": 1, "quantity_change": 1},
+        {"product_id": product_id, "quantity_change": 2},
+    ]
+    changes = client.post("/v1/inventory/bulk-update", json={"updates": updates})
+    assert changes.status_code == 200
+    assert changes.json()[0] == {
+        "product_id": product_id,
+        "product_name": "test",
+        "quantity_change": 7,
+        "new_quantity": 7,
+    }
+
+    change = client.post(
+        "/v1/inventory/update",
+        json={"product_id": product_id, "quantity_change": -3},
+    )
+    assert change.json()["new_quantity"] == 4
+
+
+def test_inventory_has_one_row_per_product(client, product_id):
+    client.post(
+        "/v1/inventory/update", json={"product_id": product_id, "quantity_change": 1}
+    )
+    with pytest.raises(IntegrityError):
+        with get_connection().begin() as connection:
+            connection.execute(
+                insert(Inventory.__table__),
+                {"product_id": product_id, "quantity": 1, "date": date.today()},
+            )
+
+
+def test_history_rejects_oversized_requests(client):
+    start = date(2023, 1, 1)
+    end = start + timedelta(days=config.INVENTORY_HISTORY_MAX_DAYS - 1)
+    params = {"product_ids": [1], "start_date": start, "end_date": end}
+    assert client.get("/v1/inventory/history", params=params).status_code == 200
+
+    params["end_date"] = end + timedelta(days=1)
+    assert client.get("/v1/inventory/history", params=params).status_code == 400
+
+    product_ids = list(range(1, config.INVENTORY_HISTORY_MAX_PRODUCTS + 2))
+    params = {"product_ids": product_ids, "start_date": start, "end_date": start}
+    assert client.get("/v1/inventory/history", params=params).status_code == 400
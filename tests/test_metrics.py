@@ -0,0 +1,11 @@
+def test_metrics_exposition(client):
+    client.get("/v1/products/", params={"limit": 5})
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_requests_total{method="GET",route="/v1/products/",status="200"}' in (
+        response.text
+    )
+    assert 'db_pool_size{pool="primary"}' in response.text
+    assert "db_query_duration_seconds_count" in response.text
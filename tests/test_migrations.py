@@ -0,0 +1,53 @@
+from datetime import date
+
+from alembic import command
+from sqlalchemy import create_engine, text
+
+from core.config import config
+from core.database.migrations import get_alembic_config
+
+
+def test_unique_inventory_merges_duplicate_rows(tmp_path, monkeypatch):
+    database_url = f"sqlite:///{tmp_path / 'migrations.db'}"
+    monkeypatch.setattr(config, "DATABASE_URL", database_url)
+    alembic_config = get_alembic_config()
+    engine = create_engine(database_url)
+
+    # Before the ledger, so that it is opened from the duplicate rows
+    command.upgrade(alembic_config, "5d2a7c81e4b0")
+    with engine.begin() as connection:
+        connection.execute(text("INSERT INTO categories (id, name) VALUES (1, 'c')"))
+        connection.execute(
+            text(
+                "INSERT INTO products (id, name, description, price, category_id) "
+                "VALUES (1, 'p', 'p', 1.0, 1), (2, 'q', 'q', 1.0, 1)"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO inventory (date, quantity, product_id) VALUES (:d, :q, :p)"
+            ),
+            [
+                {"d": date(2024, 1, 1), "q": 5, "p": 1},
+                {"d": date(2024, 1, 1), "q": 50, "p": 1},
+                {"d": date(2024, 1, 1), "q": 7, "p": 2},
+            ],
+        )
+    command.upgrade(alembic_config, "head")
+
+    with engine.connect() as connection:
+        inventory = connection.execute(
+            text("SELECT product_id, quantity FROM inventory ORDER BY product_id")
+        ).all()
+        ledger = connection.execute(
+            text(
+                "SELECT product_id, quantity_after FROM inventory_movements "
+                "ORDER BY product_id, ts, id"
+            )
+        ).all()
+    engine.dispose()
+
+    assert [tuple(row) for row in inventory] == [(1, 55), (2, 7)]
+    # The last movement of each product matches its stock
+    last = {row.product_id: row.quantity_after for row in ledger}
+    assert last == {1: 55, 2: 7}
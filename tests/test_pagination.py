@@ -0,0 +1,72 @@
+import pytest
+
+from core.config import config
+
+# Path, filters and the key identifying a row of each keyset paginated route
+KEYSET_ROUTES = [
+    ("/v1/inventory/", {}, "product_id"),
+    (
+        "/v1/inventory/",
+        {"only_low_stock": "true", "low_stock_threshold": 500},
+        "product_id",
+    ),
+    ("/v1/products/", {}, "id"),
+    ("/v1/sales/", {}, "id"),
+]
+
+
+@pytest.mark.parametrize("path, filters, key", KEYSET_ROUTES)
+def test_keyset_pages_cover_every_row(client, path, filters, key):
+    rows = []
+    while True:
+        params = {**filters, "limit": config.PAGE_SIZE_MAX, "offset": len(rows)}
+        page = client.get(path, params=params).json()
+        if not page:
+            break
+        rows += page
+    assert rows
+
+    seen = []
+    cursor = ""
+    while cursor is not None:
+        params = {**filters, "limit": 7, "cursor": cursor}
+        page = client.get(path, params=params).json()
+        assert len(page["items"]) <= 7
+        seen += [item[key] for item in page["items"]]
+        cursor = page["next_cursor"]
+
+    # Keyset pages may be ordered differently from offset pages
+    assert len(set(seen)) == len(seen)
+    assert sorted(seen) == sorted(row[key] for row in rows)
+
+
+@pytest.mark.parametrize("path, filters, key", KEYSET_ROUTES)
+@pytest.mark.parametrize("limit", [0, -1])
+def test_page_size_is_positive(client, path, filters, key, limit):
+    for params in ({"limit": limit}, {"limit": limit, "cursor": ""}):
+        assert client.get(path, params=params).status_code == 422
+
+
+@pytest.mark.parametrize("path", ["/v1/products/", "/v1/sales/"])
+def test_only_cursor_pages_are_capped(client, monkeypatch, path):
+    monkeypatch.setattr(config, "PAGE_SIZE_MAX", 5)
+
+    assert len(client.get(path, params={"limit": 8}).json()) == 8
+    page = client.get(path, params={"limit": 8, "cursor": ""}).json()
+    assert len(page["items"]) == 5
+
+
+def test_inventory_returns_every_product_by_default(client):
+    products = client.get("/v1/inventory/").json()
+    params = {"limit": config.PAGE_SIZE_MAX, "cursor": ""}
+    page = client.get("/v1/inventory/", params=params).json()
+
+    assert page["next_cursor"] is None
+    assert [row["product_id"] for row in products] == [
+        item["product_id"] for item in page["items"]
+    ]
+
+
+def test_inventory_cursor_pages_are_clamped(client):
+    params = {"limit": config.PAGE_SIZE_MAX + 1, "cursor": ""}
+    assert client.get("/v1/inventory/", params=params).status_code == 200
@@ -0,0 +1,40 @@
+def pool_checkouts(client) -> dict:
+    pools = client.get("/v1/monitoring/pool").json()
+    return {pool["name"]: pool["checkouts"] for pool in pools}
+
+
+def test_unreachable_replica_is_skipped(client):
+    client.cookies.clear()
+    for _ in range(4):
+        assert client.get("/v1/sales/analyze").status_code == 200
+
+    replicas = client.get("/v1/monitoring/replicas").json()
+    assert [replica["healthy"] for replica in replicas] == [True, False]
+
+
+def test_reads_go_to_replicas(client):
+    client.cookies.clear()
+    before = pool_checkouts(client)
+    assert client.get("/v1/sales/", params={"limit": 5}).status_code == 200
+    after = pool_checkouts(client)
+
+    assert after["replica-0"] == before["replica-0"] + 1
+    assert after["primary"] == before["primary"]
+
+
+def test_reads_after_write_go_to_primary(client):
+    client.cookies.clear()
+    response = client.post(
+        "/v1/inventory/update", json={"product_id": 2, "quantity_change": 1}
+    )
+    assert "last_write" in response.cookies
+
+    before = pool_checkouts(client)
+    assert client.get("/v1/sales/", params={"limit": 5}).status_code == 200
+    response = client.get("/v1/sales/export", params={"end_date": "2021-01-10"})
+    assert response.status_code == 200
+    after = pool_checkouts(client)
+
+    assert after["primary"] == before["primary"] + 2
+    assert after["replica-0"] == before["replica-0"]
+    client.cookies.clear()
@@ -0,0 +1,68 @@
+from datetime import date
+
+import pytest
+
+from tests.conftest import END_DATE, START_DATE
+
+
+@pytest.fixture
+def weeks() -> int:
+    # Reaches back before the first sale of the dataset
+    return (date.today() - START_DATE).days // 7 + 1
+
+
+def total(series: list) -> float:
+    return round(sum(row["total_revenue"] for row in series), 2)
+
+
+def test_weekly_revenue_matches_daily(client, weeks):
+    daily = client.get("/v1/revenue/daily", params={"days": weeks * 7}).json()
+    weekly = client.get("/v1/revenue/weekly", params={"weeks": weeks}).json()
+
+    assert weekly
+    assert total(weekly) == pytest.approx(total(daily))
+
+
+def test_dense_weekly_revenue_keeps_sales(client, weeks):
+    params = {"weeks": weeks, "dense": "true", "format": "columns"}
+    columns = client.get("/v1/revenue/weekly", params=params).json()
+    daily = client.get("/v1/revenue/daily", params={"days": weeks * 7}).json()
+
+    assert len(columns["dates"]) == len(columns["revenue"]) >= weeks
+    assert round(sum(columns["revenue"]), 2) == pytest.approx(total(daily))
+
+
+def test_summary_series_match_their_endpoints(client, weeks):
+    # Each range starts at a different point of the dataset
+    ranges = {"days": weeks * 7 - 500, "weeks": weeks, "months": weeks // 4, "years": 4}
+    period = {"start_date": START_DATE.isoformat(), "end_date": END_DATE.isoformat()}
+    summary = client.get("/v1/revenue/summary", params={**period, **ranges}).json()
+
+    for series, path, param, label in [
+        ("daily", "/v1/revenue/daily", "days", "date"),
+        ("weekly", "/v1/revenue/weekly", "weeks", "week"),
+        ("monthly", "/v1/revenue/monthly", "months", "month"),
+        ("annual", "/v1/revenue/annual", "years", "year"),
+    ]:
+        expected = client.get(path, params={param: ranges[param]}).json()
+        assert expected
+        assert [row[label] for row in summary[series]] == [
+            row[label] for row in expected
+        ]
+        assert [row["total_revenue"] for row in summary[series]] == pytest.approx(
+            [row["total_revenue"] for row in expected]
+        )
+
+    total = client.get("/v1/revenue/timeperiod", params=period).json()
+    assert summary["total"]["total_revenue"] == pytest.approx(total["total_revenue"])
+
+
+def test_summary_requires_a_range_per_series(client):
+    response = client.get("/v1/revenue/summary", params={"series": ["daily"]})
+    assert response.status_code == 400
+
+    response = client.get(
+        "/v1/revenue/summary", params={"series": ["daily"], "days": 30}
+    )
+    assert response.status_code == 200
+    assert response.json()["weekly"] is None
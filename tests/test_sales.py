@@ -0,0 +1,23 @@
+import pytest
+from sqlalchemy import func, select
+
+from app.models.models import Sale
+from core.database.session import get_connection
+
+
+def test_sales_analysis_totals(client):
+    analysis = client.get("/v1/sales/analyze").json()
+
+    with get_connection().connect() as connection:
+        total_sales, average_revenue = connection.execute(
+            select(func.sum(Sale.quantity), func.avg(Sale.revenue))
+        ).one()
+
+    assert analysis["total_sales"] == total_sales
+    assert analysis["average_revenue"] == pytest.approx(average_revenue)
+    assert sum(row["total_sales"] for row in analysis["sales_per_product"]) == (
+        total_sales
+    )
+    assert sum(row["total_sales"] for row in analysis["sales_per_category"]) == (
+        total_sales
+    )